@@ -0,0 +1,103 @@
+# SPDX-License-Identifier: MPL-2.0
+"""Synthetic large environments for benchmarks."""
+
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass, field
+from types import ModuleType
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from session_info2._dists import packages_distributions
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from importlib.metadata import Distribution
+    from pathlib import Path
+
+
+SIZES = [100, 1_000, 10_000]
+EDITABLE_EVERY = 50
+"""Every n-th distribution is an editable install via a ``.pth`` file."""
+NS_DEPTH = 6
+"""Depth of namespace packages in editable installs."""
+
+
+@dataclass
+class SyntheticEnv:
+    """Generated site-packages with matching modules and globals."""
+
+    site_packages: Path
+    n: int
+    modules: dict[str, ModuleType] = field(default_factory=dict)
+    user_globals: dict[str, Any] = field(default_factory=dict)
+    pkg2dists: dict[str, list[str]] = field(default_factory=dict)
+    dist_index: dict[str, Distribution] = field(default_factory=dict)
+
+
+def make_env(root: Path, n: int) -> SyntheticEnv:
+    r"""Generate a site-packages directory with `n` distributions.
+
+    Odd distributions declare ``top_level.txt``, even ones only have a ``RECORD``,
+    and every :data:`EDITABLE_EVERY`\ th is an editable install with a ``.pth`` file
+    pointing to a source directory that also contains a deep namespace package.
+    Half of the packages are referenced from globals, the other half only loaded.
+    """
+    env = SyntheticEnv(root / "site-packages", n)
+    env.site_packages.mkdir(parents=True)
+    for i in range(n):
+        name = f"synth{i}"
+        di = env.site_packages / f"{name}-1.{i}.dist-info"
+        di.mkdir()
+        (di / "METADATA").write_text(
+            f"Metadata-Version: 2.1\nName: {name}\nVersion: 1.{i}\n"
+        )
+        if i % EDITABLE_EVERY == 0:
+            src = root / "src" / name
+            (src / name).mkdir(parents=True)
+            (src / name / "__init__.py").touch()
+            ns_leaf = src.joinpath(*(f"{name}_ns{d}" for d in range(NS_DEPTH)))
+            ns_leaf.mkdir(parents=True)
+            (ns_leaf / "__init__.py").touch()
+            pth = f"__editable__.{name}-1.{i}.pth"
+            (env.site_packages / pth).write_text(f"{src}\n")
+            (di / "RECORD").write_text(f"{pth},,\n{di.name}/RECORD,,\n")
+        elif i % 2:
+            (di / "top_level.txt").write_text(f"{name}\n")
+        else:
+            (di / "RECORD").write_text(
+                f"{name}/__init__.py,,\n{name}/core.py,,\n{di.name}/RECORD,,\n"
+            )
+
+        mod = env.modules[name] = ModuleType(name)
+        core = env.modules[f"{name}.core"] = ModuleType(f"{name}.core")
+        if i % 2:
+            continue  # only loaded, i.e. a dependency
+        match i % 6:
+            case 0:
+                env.user_globals[name] = mod
+            case 2:
+                env.user_globals[f"fn{i}"] = fn = lambda: None
+                fn.__module__ = core.__name__
+            case _:
+                cls = type(f"Cls{i}", (), dict(__module__=core.__name__))
+                env.user_globals[f"obj{i}"] = cls()
+    env.pkg2dists = dict(
+        packages_distributions([env.site_packages], index=env.dist_index)
+    )
+    return env
+
+
+@pytest.fixture(scope="session", params=SIZES, ids=lambda n: f"{n}dists")
+def synthetic_env(
+    request: pytest.FixtureRequest, tmp_path_factory: pytest.TempPathFactory
+) -> Generator[SyntheticEnv, None, None]:
+    n: int = request.param
+    env = make_env(tmp_path_factory.mktemp(f"env{n}"), n)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.syspath_prepend(str(env.site_packages))
+        for name, mod in env.modules.items():
+            mp.setitem(sys.modules, name, mod)
+        yield env
@@ -0,0 +1,72 @@
+# SPDX-License-Identifier: MPL-2.0
+"""Benchmarks for scanning, attribution, version lookup and rendering."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from session_info2 import SessionInfo, _AdditionalInfo
+from session_info2._dists import packages_distributions
+from session_info2._repr import MIME_REPRS
+
+if TYPE_CHECKING:
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+    from benchmarks.conftest import SyntheticEnv
+
+
+INFO = _AdditionalInfo(os=None, cpu=None, gpu=())
+SLOW = dict(rounds=3, iterations=1)
+"""Arguments for :meth:`BenchmarkFixture.pedantic` for benchmarks taking seconds."""
+
+
+def make_si(env: SyntheticEnv) -> SessionInfo:
+    return SessionInfo(
+        env.pkg2dists,
+        env.user_globals,
+        dependencies=True,
+        info=INFO,
+        dist_index=env.dist_index,
+    )
+
+
+def test_scan(benchmark: BenchmarkFixture, synthetic_env: SyntheticEnv) -> None:
+    pkg2dists = benchmark(packages_distributions, [synthetic_env.site_packages])
+    assert len(pkg2dists) == synthetic_env.n
+
+
+def test_attribution(benchmark: BenchmarkFixture, synthetic_env: SyntheticEnv) -> None:
+    imported = benchmark(lambda: make_si(synthetic_env).imported_dists)
+    assert len(imported) == synthetic_env.n // 2
+
+
+def test_deps(benchmark: BenchmarkFixture, synthetic_env: SyntheticEnv) -> None:
+    deps = benchmark(lambda: make_si(synthetic_env).deps_dists)
+    assert len(deps) == synthetic_env.n // 2
+
+
+def test_version(benchmark: BenchmarkFixture, synthetic_env: SyntheticEnv) -> None:
+    si = make_si(synthetic_env)
+    dists = [*si.imported_dists, *si.deps_dists]
+    # bypass cache
+    version = SessionInfo._version_static.__wrapped__  # type: ignore[attr-defined]  # noqa: SLF001
+
+    versions = benchmark.pedantic(  # type: ignore[no-untyped-call]
+        lambda: [version(si, d) for d in dists], **SLOW
+    )
+    assert len(versions) == synthetic_env.n
+
+
+@pytest.mark.parametrize(
+    "mime", ["text/plain", "text/markdown", "text/html", "application/json"]
+)
+def test_render(
+    benchmark: BenchmarkFixture, synthetic_env: SyntheticEnv, mime: str
+) -> None:
+    si = make_si(synthetic_env)
+    repr_fn = MIME_REPRS[mime]  # type: ignore[index]
+    assert benchmark.pedantic(  # type: ignore[no-untyped-call]
+        repr_fn, (si,), **SLOW
+    )
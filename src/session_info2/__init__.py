@@ -3,47 +3,164 @@
 
 from __future__ import annotations
 
-import platform
 import sys
 from collections import defaultdict
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
-from functools import cached_property
-from importlib.metadata import version
+from threading import RLock
 from types import MappingProxyType, ModuleType
 from typing import TYPE_CHECKING, Any, Literal, TypeAlias
 
-from . import _pu
-from ._dists import packages_distributions
-from ._repr import repr_mimebundle as _repr_mimebundle
+from ._sync import once_property, snapshot
+from ._timing import phase
 from ._ttl_cache import ttl_cache
-from ._widget import widget as _widget
 
 if TYPE_CHECKING:
-    from collections.abc import Collection, Generator, Iterable, Mapping, Sequence
+    from collections.abc import (
+        Collection,
+        Container,
+        Generator,
+        Iterable,
+        Mapping,
+        Sequence,
+    )
     from collections.abc import Set as AbstractSet
+    from importlib.metadata import Distribution
+    from pathlib import Path
+
+    from ipywidgets import Widget
+
+    from ._autolog import start_autolog as start_autolog
+    from ._build import BuildVariant as BuildVariant
+    from ._crash import CrashSnapshot as CrashSnapshot
+    from ._crash import install_crash_hooks as install_crash_hooks
+    from ._envs import scan_environments as scan_environments
+    from ._filter import DistFilter as DistFilter
+    from ._filter import Pattern
+    from ._graph import DependencyGraph
+    from ._matrix import VersionMatrix as VersionMatrix
+    from ._repr import SupportedMime
+    from ._resolve import DistResolver as DistResolver
+    from ._sampler import ResourceSampler as ResourceSampler
+    from ._sampler import start_sampler as start_sampler
+    from ._storage import StorageInfo as StorageInfo
+    from ._timing import Timings as Timings
+    from ._vcs import GitState
+    from ._workers import WorkerSessions as WorkerSessions
+    from ._workers import WorkerSnapshot as WorkerSnapshot
+    from ._workers import collect_worker_sessions as collect_worker_sessions
 
     _TableHeader: TypeAlias = (
         tuple[Literal["Package"], Literal["Version"]]
         | tuple[Literal["Dependency"], Literal["Version"]]
+        | tuple[Literal["Distribution"], Literal["Build"]]
         | tuple[Literal["Component"], Literal["Info"]]
     )
 
 
-# TODO: make this configurable
-# https://github.com/flying-sheep/session-info2/issues/6
-IGNORED = frozenset({"ipython", "session-info2"})
+# Public names defined in submodules, imported on first access (:pep:`562`).
+# This keeps `import session_info2` cheap, e.g. in service startup paths.
+_LAZY_ATTRS = {
+    "BuildVariant": "_build",
+    "collect_worker_sessions": "_workers",
+    "DistFilter": "_filter",
+    "DistResolver": "_resolve",
+    "CrashSnapshot": "_crash",
+    "install_crash_hooks": "_crash",
+    "ResourceSampler": "_sampler",
+    "scan_environments": "_envs",
+    "start_sampler": "_sampler",
+    "start_autolog": "_autolog",
+    "StorageInfo": "_storage",
+    "Timings": "_timing",
+    "VersionMatrix": "_matrix",
+    "WorkerSessions": "_workers",
+    "WorkerSnapshot": "_workers",
+}
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    if name == "IGNORED":
+        import warnings
+
+        from ._filter import DEFAULT_EXCLUDE
+
+        msg = (
+            "`session_info2.IGNORED` is deprecated, "
+            "use `DistFilter` or the `exclude` parameter of `session_info` instead"
+        )
+        warnings.warn(msg, DeprecationWarning, stacklevel=2)
+        return frozenset(DEFAULT_EXCLUDE)
+    if (mod_name := _LAZY_ATTRS.get(name)) is None:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    from importlib import import_module
+
+    return getattr(import_module(f".{mod_name}", __name__), name)
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_LAZY_ATTRS})
+
+
+def _os_info() -> str:
+    import platform
+
+    return platform.platform()
+
+
+def _cpu_info() -> str:
+    from ._pu import cpu_info
+
+    return cpu_info()
+
+
+def _gpu_info(timeout: float | None = None) -> tuple[str, ...]:
+    from ._pu import gpu_info
+
+    return gpu_info(timeout=timeout)
+
+
+def _isa_flags() -> tuple[str, ...]:
+    from ._pu import isa_flags
+
+    return isa_flags()
+
+
+def _storage_info() -> StorageInfo:
+    from ._storage import StorageInfo
+
+    return StorageInfo.read()
+
+
+def _dist_filter() -> DistFilter:
+    from ._filter import DistFilter
+
+    return DistFilter()
+
+
+def _resource_sampler() -> ResourceSampler | None:
+    # If the module isn’t loaded, no sampler was started, so don’t import it.
+    if (mod := sys.modules.get(f"{__name__}._sampler")) is None:
+        return None
+    return mod.active_sampler()  # type: ignore[no-any-return]
+
+
+def _date() -> str:
+    from datetime import datetime, timezone
+
+    return datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M")
 
 
 @dataclass
 class _AdditionalInfo:
     sys: str = field(default_factory=lambda: sys.version.replace("\n", ""))
-    os: str | None = field(default_factory=platform.platform)
-    cpu: str | None = field(default_factory=_pu.cpu_info)
-    gpu: Collection[str] = field(default_factory=_pu.gpu_info)
-    date: str = field(
-        default_factory=lambda: datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M")
-    )
+    os: str | None = field(default_factory=_os_info)
+    cpu: str | None = field(default_factory=_cpu_info)
+    gpu: Collection[str] = field(default_factory=_gpu_info)
+    date: str = field(default_factory=_date)
+    isa: Collection[str] = ()
+    resources: ResourceSampler | None = field(default_factory=_resource_sampler)
+    storage: StorageInfo | None = None
 
     def _table(self) -> Generator[tuple[str, str], None, None]:
         yield ("Python", self.sys)
@@ -51,8 +168,14 @@ class _AdditionalInfo:
             yield ("OS", self.os)
         if self.cpu:
             yield ("CPU", self.cpu)
+        if self.isa:
+            yield ("CPU ISA", " ".join(self.isa))
         for gpu in self.gpu:
             yield ("GPU", gpu)
+        if self.resources is not None:
+            yield from self.resources._table()  # noqa: SLF001
+        if self.storage is not None:
+            yield from self.storage._table()  # noqa: SLF001
         yield ("Updated", self.date)
 
 
@@ -62,6 +185,11 @@ class SessionInfo:
 
     Can be displayed as string (:meth:`__repr__`),
     Markdown/HTML (:meth:`_repr_mimebundle_`), or as a :meth:`widget`).
+
+    Instances can be shared between threads (also on free-threaded builds):
+    derived properties are computed once, on first access,
+    and :data:`sys.modules` and :attr:`user_globals` are snapshotted
+    at that point, so concurrent imports or assignments can’t break them.
     """
 
     pkg2dists: Mapping[str, Sequence[str]]
@@ -75,7 +203,31 @@ class SessionInfo:
 
     info: _AdditionalInfo = field(default_factory=_AdditionalInfo)
 
-    @cached_property
+    timings: Timings | None = field(default=None, compare=False)
+    """Timings of collecting and rendering phases (`None` if disabled)."""
+
+    dependency_graph: bool = False
+    """Whether to include a graph of requirements between loaded distributions."""
+
+    build_variants: bool = False
+    """Whether to include how each distribution was built and installed."""
+
+    dist_filter: DistFilter = field(default_factory=_dist_filter)
+    """Which distributions to report (by default all but IPython and this package).
+
+    Applied before looking up any metadata or versions.
+    """
+
+    dist_index: Mapping[str, Distribution] = field(default_factory=dict, compare=False)
+    """Distributions found when scanning for :attr:`pkg2dists`, by name.
+
+    Used to read versions and build variants
+    without searching for each distribution again.
+    """
+
+    _lock: RLock = field(default_factory=RLock, init=False, repr=False, compare=False)
+
+    @once_property
     def dist2pkgs(self) -> Mapping[str, frozenset[str]]:
         """Mapping of distributions to packages."""
         d2ps: defaultdict[str, set[str]] = defaultdict(set)
@@ -84,46 +236,154 @@ class SessionInfo:
                 d2ps[dist].add(pkg)
         return MappingProxyType({d: frozenset(pkgs) for d, pkgs in d2ps.items()})
 
-    @cached_property
+    @once_property
+    def resolver(self) -> DistResolver:
+        """Resolver of module names to distributions, using :attr:`pkg2dists`."""
+        from ._resolve import DistResolver
+
+        return DistResolver(self.pkg2dists)
+
+    @once_property
     def imported_dists(self) -> AbstractSet[str]:
         """Ordered set of imported distributions."""
         # Use dict for preserving insertion order
         imported: dict[str, None] = {}
-        for obj in self.user_globals.values():
-            mod_name = _get_module_name(obj)
-            dist_name = next(
-                (d for mn in _mods(mod_name) for d in self.pkg2dists.get(mn, ())),
-                None,
-            )
-            if dist_name is not None and dist_name.casefold() not in IGNORED:
-                imported[dist_name] = None
+        resolve, keep = self.resolver, self.dist_filter
+        with phase(self.timings, "attribution"):
+            for obj in snapshot(self.user_globals).values():
+                dist_name = resolve(_get_module_name(obj))
+                if dist_name is not None and keep(dist_name):
+                    imported[dist_name] = None
         return imported.keys()
 
-    @cached_property
+    @once_property
     def deps_dists(self) -> AbstractSet[str]:
         """Ordered set of loaded distributions that aren’t imported."""
-        return {
-            dist
-            for dist, pkgs in self.dist2pkgs.items()
-            if pkgs & sys.modules.keys()
-            if dist not in self.imported_dists
-        }
+        imported, keep = self.imported_dists, self.dist_filter
+        with phase(self.timings, "attribution"):
+            loaded = snapshot(sys.modules).keys()
+            return {
+                dist
+                for dist, pkgs in self.dist2pkgs.items()
+                if dist not in imported
+                if keep(dist)
+                if pkgs & loaded
+            }
 
-    def __hash__(self) -> int:
-        """Generate hash value."""
+    @once_property
+    def dep_graph(self) -> DependencyGraph:
+        """Requirements between loaded distributions (from ``Requires-Dist``)."""
+        from ._graph import DependencyGraph
+
+        imported, deps = self.imported_dists, self.deps_dists
+        requirements = self.requirements
+        with phase(self.timings, "graph"):
+            return DependencyGraph.from_dists(imported, deps, requirements)
+
+    @once_property
+    def requirements(self) -> Mapping[str, frozenset[str]]:
+        """Normalized names of the distributions each loaded one requires.
+
+        Parsed from ``Requires-Dist`` of imported and loaded distributions,
+        read via :attr:`dist_index` where possible.
+        """
+        from ._graph import parse_requirements
+
+        with phase(self.timings, "requirements"):
+            return MappingProxyType(
+                {
+                    name: parse_requirements(dist)
+                    for name in (*self.imported_dists, *self.deps_dists)
+                    if (dist := self._dist(name)) is not None
+                }
+            )
+
+    @once_property
+    def builds(self) -> Mapping[str, BuildVariant]:
+        """How imported and loaded distributions were built and installed."""
+        from ._build import BuildVariant
+
+        with phase(self.timings, "builds"):
+            return MappingProxyType(
+                {
+                    name: BuildVariant.from_dist(dist)
+                    for name in (*self.imported_dists, *self.deps_dists)
+                    if (dist := self._dist(name)) is not None
+                }
+            )
+
+    def _dist(self, name: str) -> Distribution | None:
+        """Get distribution from the index, or search for it if not indexed."""
+        from importlib.metadata import PackageNotFoundError, distribution
+
+        if (dist := self.dist_index.get(name)) is not None:
+            return dist
+        try:
+            return distribution(name)
+        except PackageNotFoundError:
+            return None
+
+    def _vcs(self, dist: str) -> GitState | None:
+        """Get state of the git checkout an editable distribution is installed from."""
+        from ._build import editable_location
+        from ._vcs import find_repo, git_state
+
+        with phase(self.timings, "vcs"):
+            if (d := self._dist(dist)) is None:
+                return None
+            if (location := editable_location(d)) is None:
+                return None
+            if (root := find_repo(location)) is None:
+                return None
+            # Read each checkout once per report: packages can share one,
+            # and files can change between reports.
+            with self._lock:
+                if root not in self._git_states:
+                    self._git_states[root] = git_state(root)
+                return self._git_states[root]
+
+    @once_property
+    def _git_states(self) -> dict[Path, GitState | None]:
+        return {}
+
+    @once_property
+    def _hash(self) -> int:
         pkg2dists = tuple((pkg, *ds) for pkg, ds in self.pkg2dists.items())
         return hash((pkg2dists, tuple(self.imported_dists), self.dependencies))
 
-    @ttl_cache()
+    def __hash__(self) -> int:
+        """Generate hash value.
+
+        Computed once, since every cached :meth:`_version` call hashes `self`.
+        """
+        return self._hash
+
     def _version(self, dist: str) -> str:
-        """Get version(s) of imported distribution."""
-        v_meta = version(dist)
-        vs_attr = {
-            pkg_name: v
-            for pkg_name in self.dist2pkgs[dist]
-            if (pkg := sys.modules.get(pkg_name))
-            and (v := getattr(pkg, "__version__", None))
-        }
+        """Get version(s) of imported distribution.
+
+        Module ``__version__`` attributes are only read if statically set,
+        so packages with a lazy-loading ``__getattr__`` aren’t triggered.
+        For editable installs from a git checkout, the commit is appended.
+        """
+        v = self._version_static(dist)
+        if (vcs := self._vcs(dist)) is not None:
+            return f"{v} ({vcs})"
+        return v
+
+    @ttl_cache()
+    def _version_static(self, dist: str) -> str:
+        from importlib.metadata import PackageNotFoundError
+
+        with phase(self.timings, "version"):
+            if (d := self._dist(dist)) is None:
+                raise PackageNotFoundError(dist)
+            v_meta = d.version
+            vs_attr = {
+                pkg_name: v
+                for pkg_name in self.dist2pkgs[dist]
+                if (pkg := sys.modules.get(pkg_name))
+                and (v := _static_attr(pkg, "__version__"))
+            }
         if all(v_attr == v_meta for v_attr in vs_attr.values()):
             # This branch is also hit if there are no __version__ attributes
             return v_meta
@@ -144,11 +404,17 @@ class SessionInfo:
                     (d, self._version(d)) for d in self.deps_dists
                 )
             }
+        builds: dict[_TableHeader, Iterable[tuple[str, str]]] = {}
+        if self.build_variants:
+            builds = {
+                ("Distribution", "Build"): ((d, str(b)) for d, b in self.builds.items())
+            }
         return {
             ("Package", "Version"): (
                 (d, self._version(d)) for d in self.imported_dists
             ),
             **deps,
+            **builds,
             ("Component", "Info"): self.info._table(),  # noqa: SLF001
         }
 
@@ -160,47 +426,128 @@ class SessionInfo:
             if (part_fmt := "\n".join(f"{k}\t{v}" for k, v in part))
         )
 
-    _repr_mimebundle_ = _repr_mimebundle
-    widget = _widget
+    def _repr_mimebundle_(
+        self,
+        include: Container[str] | None = None,
+        exclude: Container[str] | None = None,
+        **kwargs: object,
+    ) -> dict[SupportedMime, Any]:
+        """Generate MIME bundle representations.
+
+        :param include: MIME types to include.
+        :param exclude: MIME types to exclude.
+        """
+        from ._repr import repr_mimebundle
+
+        return repr_mimebundle(self, include, exclude, **kwargs)
+
+    def widget(self) -> Widget:
+        """Generate interactive HTML representation."""
+        from ._widget import widget
 
+        return widget(self)
 
-def session_info(
+
+def session_info(  # noqa: PLR0913
     *,
     os: bool = True,
     cpu: bool = False,
     gpu: bool = False,
+    gpu_timeout: float | None = None,
     dependencies: bool | None = None,
+    dependency_graph: bool = False,
+    build_variants: bool = False,
+    storage: bool = False,
+    include: Iterable[Pattern] | None = None,
+    exclude: Iterable[Pattern] | None = None,
+    timings: bool | Timings | None = None,
+    user_globals: Mapping[str, Any] | None = None,
 ) -> SessionInfo:
     """Display versions of imported packages and the system.
 
     :param os: Include OS name and version.
     :param cpu: Include number of CPU cores.
     :param gpu: Include information per supported GPU.
+    :param gpu_timeout: Maximum number of seconds to wait for the GPU probe.
     :param dependencies: Print versions of dependencies.
+    :param dependency_graph: Include a graph of which loaded distributions
+        require which others (in Markdown, HTML, and JSON representations).
+    :param build_variants: Include wheel tags, installer, and source URL
+        of each distribution, and instruction set extensions the CPU supports.
+    :param storage: Include filesystems of the working, temporary,
+        and site-packages directories, and the memory configuration
+        (RAM, swap, transparent hugepages). Only available on Linux.
+    :param include: Patterns of distributions to report (default: all).
+        Globs, or regular expressions if compiled or prefixed with ``re:``.
+        (`None` means the ``SESSION_INFO2_INCLUDE`` environment variable
+        or the ``include`` key in the ``[tool.session-info2]`` table
+        of the closest ``pyproject.toml`` is used, see :meth:`DistFilter.resolve`.
+        Reading ``pyproject.toml`` on Python 3.10 needs :mod:`tomli`.)
+    :param exclude: Patterns of distributions to leave out,
+        configurable the same way (default: IPython and session-info2).
+    :param timings: Record wall time and call counts per phase
+        in :attr:`SessionInfo.timings`.
+        Pass a :class:`Timings` instance to specify a hook for each span.
+        (`None` means enabled if the ``SESSION_INFO2_TIMINGS`` environment variable
+        is set to something else than ``0`` or ``false``.)
+    :param user_globals: Variables to find imported packages in
+        (default: the globals of ``__main__``).
 
     :return: Collected information about the session.
     """
-    pkg2dists = packages_distributions()
-    user_globals = vars(sys.modules["__main__"])
+    from ._dists import scan
+    from ._filter import DistFilter
+    from ._timing import resolve
+
+    t = resolve(timings)
+    dist_filter = DistFilter.resolve(include, exclude)
+    with phase(t, "scan"):
+        pkg2dists, dist_index = scan(dist_filter, timings=t)
+    if user_globals is None:
+        user_globals = vars(sys.modules["__main__"])
+    with phase(t, "os"):
+        os_info = _os_info() if os else None
+    with phase(t, "cpu"):
+        cpu_info = _cpu_info() if cpu else None
+    with phase(t, "gpu"):
+        gpu_info = _gpu_info(gpu_timeout) if gpu else ()
+    with phase(t, "isa"):
+        isa = _isa_flags() if build_variants else ()
+    with phase(t, "storage"):
+        storage_info = _storage_info() if storage else None
     info = _AdditionalInfo(
-        **({} if os else dict(os=None)),  # type: ignore[arg-type]
-        **({} if cpu else dict(cpu=None)),  # type: ignore[arg-type]
-        **({} if gpu else dict(gpu=())),  # type: ignore[arg-type]
+        os=os_info, cpu=cpu_info, gpu=gpu_info, isa=isa, storage=storage_info
+    )
+    return SessionInfo(
+        pkg2dists,
+        user_globals,
+        dependencies=dependencies,
+        info=info,
+        timings=t,
+        dependency_graph=dependency_graph,
+        build_variants=build_variants,
+        dist_filter=dist_filter,
+        dist_index=dist_index,
     )
-    return SessionInfo(pkg2dists, user_globals, dependencies=dependencies, info=info)
 
 
 def _get_module_name(obj: object) -> str:
     """Get module name."""
     if isinstance(obj, ModuleType):
-        return obj.__name__
+        return _static_attr(obj, "__name__")  # type: ignore[no-any-return]
     if isinstance(mod := getattr(obj, "__module__", None), str):
         return mod
     return type(obj).__module__
 
 
-def _mods(mod_name: str) -> Generator[str, None, None]:
-    """Generate parent module names, starting with input."""
-    parts = mod_name.split(".")
-    for i in reversed(range(len(parts))):
-        yield ".".join(parts[: i + 1])
+def _static_attr(mod: ModuleType, name: str) -> Any:  # noqa: ANN401
+    """Get a module attribute without triggering dynamic attribute hooks.
+
+    This neither calls module-level ``__getattr__`` (:pep:`562`)
+    nor loads modules created by :class:`importlib.util.LazyLoader`.
+    """
+    try:
+        ns = object.__getattribute__(mod, "__dict__")
+    except AttributeError:
+        return None
+    return ns.get(name)
@@ -3,6 +3,126 @@
 
 from __future__ import annotations
 
-from . import session_info
+import argparse
+import importlib
+from pathlib import Path
+from typing import TYPE_CHECKING
 
-print(session_info(cpu=True, dependencies=True))
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from ._repr import SupportedMime
+
+
+FORMATS: dict[str, SupportedMime] = {
+    "text": "text/plain",
+    "markdown": "text/markdown",
+    "html": "text/html",
+    "json": "application/json",
+}
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="python -m session_info2",
+        description="Print versions of packages and information about the system.",
+    )
+    parser.add_argument(
+        "modules",
+        nargs="*",
+        metavar="MODULE",
+        help="modules to import before collecting information",
+    )
+    parser.add_argument(
+        "-f", "--format", choices=FORMATS, default="text", help="output format"
+    )
+    parser.add_argument(
+        "--no-deps",
+        dest="dependencies",
+        action="store_false",
+        help="don’t include versions of loaded dependencies",
+    )
+    parser.add_argument(
+        "--no-cpu",
+        dest="cpu",
+        action="store_false",
+        help="don’t include the number of CPU cores",
+    )
+    parser.add_argument(
+        "--gpu", action="store_true", help="include information per supported GPU"
+    )
+    parser.add_argument(
+        "--builds",
+        dest="build_variants",
+        action="store_true",
+        help="include wheel tags, installer, and source of each distribution",
+    )
+    parser.add_argument(
+        "--storage",
+        action="store_true",
+        help="include filesystems of relevant directories and memory configuration",
+    )
+    parser.add_argument(
+        "--include",
+        action="append",
+        metavar="PATTERN",
+        help="only report distributions matching PATTERN (glob, or re:REGEX)",
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        metavar="PATTERN",
+        help="don’t report distributions matching PATTERN (glob, or re:REGEX)",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="maximum time to wait for the GPU probe (requires --gpu)",
+    )
+    parser.add_argument(
+        "-o", "--output", type=Path, metavar="FILE", help="write output to FILE"
+    )
+    args = parser.parse_args(argv)
+    if args.timeout is not None and not args.gpu:
+        parser.error("--timeout only applies to the GPU probe, pass --gpu as well")
+    return args
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Run CLI."""
+    args = parse_args(argv)
+    user_globals = {
+        name.rpartition(".")[2]: importlib.import_module(name) for name in args.modules
+    }
+
+    from . import session_info
+
+    si = session_info(
+        cpu=args.cpu,
+        gpu=args.gpu,
+        gpu_timeout=args.timeout,
+        dependencies=args.dependencies,
+        build_variants=args.build_variants,
+        storage=args.storage,
+        include=args.include,
+        exclude=args.exclude,
+        user_globals=user_globals,
+    )
+    if args.format == "text":
+        out = repr(si)
+    else:
+        from ._repr import MIME_REPRS
+
+        out = str(MIME_REPRS[FORMATS[args.format]](si))
+
+    if args.output is None:
+        print(out)
+    else:
+        args.output.write_text(f"{out}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# SPDX-License-Identifier: MPL-2.0
+"""Log session info once at startup, without delaying it.
+
+Enable via the ``SESSION_INFO2_AUTOLOG`` environment variable
+(set to a delay in seconds, or ``1``/``true``/``yes``/``on`` for the default delay),
+or by calling :func:`start_autolog`.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import suppress
+
+ENV_VAR = "SESSION_INFO2_AUTOLOG"
+DEFAULT_DELAY = 5.0
+TRUE_VALUES = frozenset({"1", "true", "yes", "on"})
+FALSE_VALUES = frozenset({"", "0", "false", "no", "off"})
+
+logger = logging.getLogger("session_info2")
+
+_lock = threading.Lock()
+_thread: threading.Thread | None = None
+
+
+def start_autolog(
+    *,
+    delay: float = DEFAULT_DELAY,
+    gpu: bool = False,
+    level: int = logging.INFO,
+    log: logging.Logger = logger,
+) -> threading.Thread:
+    """Log session info once, from a background thread.
+
+    The thread is a daemon, so it never blocks interpreter shutdown,
+    and it waits for `delay` seconds to not compete with startup work.
+    Packages imported in that time are included in the report.
+    The record’s message is JSON, and its ``session_info`` attribute
+    contains the same data as :class:`dict`.
+
+    Calling this more than once (e.g. via environment variable and code)
+    returns the already running thread.
+
+    :param delay: Seconds to wait before collecting information.
+    :param gpu: Include information per supported GPU.
+    :param level: Log level of the record.
+    :param log: Logger to emit the record with.
+
+    :return: The background thread.
+    """
+    global _thread  # noqa: PLW0603
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(
+                target=_run,
+                kwargs=dict(delay=delay, gpu=gpu, level=level, log=log),
+                name="session_info2-autolog",
+                daemon=True,
+            )
+            _thread.start()
+        return _thread
+
+
+def install_from_env() -> threading.Thread | None:
+    """Start autologging if enabled via :data:`ENV_VAR`.
+
+    This runs at interpreter startup, so invalid values are logged, not raised.
+    """
+    value = os.environ.get(ENV_VAR, "").strip().lower()
+    if value in FALSE_VALUES:
+        return None
+    if value in TRUE_VALUES:
+        return start_autolog()
+    try:
+        delay = float(value)
+    except ValueError:
+        delay = math.nan
+    if not math.isfinite(delay):
+        logger.warning(
+            "Invalid %s=%r: expected a delay in seconds or a boolean",
+            ENV_VAR,
+            os.environ[ENV_VAR],
+        )
+        return None
+    return start_autolog(delay=max(delay, 0.0))
+
+
+def _run(*, delay: float, gpu: bool, level: int, log: logging.Logger) -> None:
+    _lower_priority()
+    time.sleep(max(delay, 0.0))
+    try:
+        import json
+
+        from . import session_info
+        from ._repr import repr_json
+
+        si = session_info(cpu=True, gpu=gpu, dependencies=True)
+        msg = repr_json(si)
+        log.log(level, msg, extra=dict(session_info=json.loads(msg)))
+    except Exception:
+        log.warning("Failed to collect session info", exc_info=True)
+
+
+def _lower_priority() -> None:
+    """Lower this thread’s CPU scheduling priority, where supported (Linux)."""
+    with suppress(AttributeError, OSError):
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
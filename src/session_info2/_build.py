@@ -0,0 +1,95 @@
+# SPDX-License-Identifier: MPL-2.0
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from urllib.parse import unquote, urlsplit
+
+if TYPE_CHECKING:
+    from importlib.metadata import Distribution
+
+
+@dataclass(frozen=True)
+class BuildVariant:
+    """How an installed distribution was built and installed.
+
+    Read from its ``.dist-info`` directory
+    (see the `recording installed projects`_ spec).
+
+    .. _recording installed projects: https://packaging.python.org/en/latest/specifications/recording-installed-packages/
+    """
+
+    tags: tuple[str, ...] = ()
+    """Wheel tags from ``WHEEL``, e.g. ``cp312-cp312-manylinux_2_17_x86_64``
+    (empty if not installed from a wheel)."""
+    installer: str | None = None
+    """Tool that installed it (from ``INSTALLER``), e.g. ``pip`` or ``conda``."""
+    url: str | None = None
+    """URL it was installed from, if not from an index (from ``direct_url.json``)."""
+    commit: str | None = None
+    """VCS commit it was installed from (from ``direct_url.json``)."""
+    editable: bool = False
+    """Whether it’s an editable install."""
+
+    @classmethod
+    def from_dist(cls, dist: Distribution) -> BuildVariant:
+        """Read build information from a distribution’s metadata directory."""
+        wheel = dist.read_text("WHEEL") or ""
+        tags = tuple(
+            value.strip()
+            for key, _, value in (line.partition(":") for line in wheel.splitlines())
+            if key == "Tag"
+        )
+        installer = (dist.read_text("INSTALLER") or "").strip() or None
+        direct_url = _direct_url(dist)
+        return cls(
+            tags=tags,
+            installer=installer,
+            url=direct_url.get("url"),
+            commit=direct_url.get("vcs_info", {}).get("commit_id"),
+            editable=direct_url.get("dir_info", {}).get("editable", False),
+        )
+
+    def __str__(self) -> str:
+        """Summarize in one line."""
+        parts = [", ".join(self.tags) or "not a wheel"]
+        if self.installer:
+            parts.append(f"via {self.installer}")
+        if self.url:
+            commit = f"@{self.commit[:12]}" if self.commit else ""
+            editable = " (editable)" if self.editable else ""
+            parts.append(f"from {self.url}{commit}{editable}")
+        return " ".join(parts)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Convert to JSON-serializable dict."""
+        return dict(asdict(self), tags=list(self.tags))
+
+
+def editable_location(dist: Distribution) -> Path | None:
+    """Get the source directory of an editable install.
+
+    Every :pep:`660` installer records it in ``direct_url.json`` (:pep:`610`).
+    """
+    direct_url = _direct_url(dist)
+    if not direct_url.get("dir_info", {}).get("editable", False):
+        return None
+    url = urlsplit(direct_url.get("url", ""))
+    if url.scheme != "file":
+        return None
+    if os.name == "nt":  # urllib.request is slow to import
+        from nturl2path import url2pathname
+
+        return Path(url2pathname(url.path))
+    return Path(unquote(url.path))
+
+
+def _direct_url(dist: Distribution) -> dict[str, Any]:
+    try:
+        direct_url = json.loads(dist.read_text("direct_url.json") or "{}")
+    except json.JSONDecodeError:
+        return {}
+    return direct_url if isinstance(direct_url, dict) else {}
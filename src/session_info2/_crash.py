@@ -0,0 +1,236 @@
+# SPDX-License-Identifier: MPL-2.0
+from __future__ import annotations
+
+import faulthandler
+import logging
+import os
+import sys
+import threading
+from contextlib import suppress
+from typing import TYPE_CHECKING
+
+from ._sync import snapshot
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from io import BufferedRandom
+    from pathlib import Path
+    from types import TracebackType
+
+    from . import SessionInfo
+
+logger = logging.getLogger("session_info2")
+
+
+class CrashSnapshot:
+    """Pre-serialized session info, ready to be written when the process crashes.
+
+    Distribution metadata is scanned once. :meth:`refresh` is cheap:
+    it does nothing if no modules were imported since the last refresh,
+    and only looks up versions of newly loaded distributions.
+    """
+
+    data: bytes
+    """The serialized snapshot."""
+
+    def __init__(self, *, cpu: bool = True, gpu: bool = False) -> None:
+        from . import SessionInfo, _AdditionalInfo, _cpu_info, _gpu_info
+        from ._dists import scan
+        from ._filter import DistFilter
+
+        self._info = _AdditionalInfo(
+            cpu=_cpu_info() if cpu else None, gpu=_gpu_info() if gpu else ()
+        )
+        # Without user globals, nothing is imported, so this instance’s hash and
+        # therefore its version cache stays valid.
+        keep = DistFilter.resolve()
+        pkg2dists, dist_index = scan(keep)
+        self._si = SessionInfo(
+            pkg2dists, {}, info=self._info, dist_filter=keep, dist_index=dist_index
+        )
+        self._versions: dict[str, str] = {}
+        self._n_modules = -1
+        self._lock = threading.Lock()
+        self._side_file: BufferedRandom | None = None
+        self._hooks: (
+            tuple[
+                Callable[
+                    [type[BaseException], BaseException, TracebackType | None], object
+                ],
+                Callable[[threading.ExceptHookArgs], object],
+            ]
+            | None
+        ) = None
+        self._faulthandler_was_enabled = False
+        self._stop = threading.Event()
+        self.data = b""
+        self.refresh()
+
+    def refresh(self, *, force: bool = False) -> bool:
+        """Re-serialize the snapshot if modules were imported since the last call.
+
+        :param force: Re-serialize even if no modules were imported.
+
+        :return: Whether the snapshot was updated.
+        """
+        with self._lock:
+            if not force and len(sys.modules) == self._n_modules:
+                return False
+            si = self._session_info()
+            for dist in (*si.imported_dists, *si.deps_dists):
+                if dist not in self._versions:
+                    self._versions[dist] = self._si._version(dist)  # noqa: SLF001
+            self.data = self._format(si).encode(errors="replace")
+            # counted afterwards, since the first refresh imports modules itself
+            self._n_modules = len(sys.modules)
+            if self._side_file is not None:
+                self._write_side_file(self._side_file)
+            return True
+
+    def _session_info(self) -> SessionInfo:
+        from . import SessionInfo
+
+        main = sys.modules.get("__main__")
+        user_globals = snapshot(vars(main)) if main is not None else {}
+        return SessionInfo(
+            self._si.pkg2dists,
+            user_globals,
+            info=self._info,
+            dist_filter=self._si.dist_filter,
+            dist_index=self._si.dist_index,
+        )
+
+    def _format(self, si: SessionInfo) -> str:
+        parts = [
+            [(d, self._versions[d]) for d in si.imported_dists],
+            [(d, self._versions[d]) for d in si.deps_dists],
+            list(self._info._table()),  # noqa: SLF001
+        ]
+        body = "\n----\t----\n".join(
+            "\n".join(f"{k}\t{v}" for k, v in part) for part in parts if part
+        )
+        return f"\n--- session info ---\n{body}\n--------------------\n"
+
+    def write(self, fd: int | None = None) -> None:
+        """Write the snapshot to a file descriptor (default: stderr).
+
+        This doesn’t allocate anything, so it’s safe to call in a broken process.
+        """
+        with suppress(OSError):
+            os.write(2 if fd is None else fd, self.data)
+
+    def _write_side_file(self, f: BufferedRandom) -> None:
+        f.seek(0)
+        f.truncate()
+        f.write(self.data)
+        f.flush()
+
+    def install(
+        self,
+        *,
+        fd: int | None = None,
+        faulthandler_file: Path | None = None,
+        refresh_interval: float | None = 30.0,
+    ) -> None:
+        """Install hooks writing the snapshot on crashes.
+
+        Installs :data:`sys.excepthook` and :data:`threading.excepthook` wrappers
+        that write the snapshot to `fd` before calling the previous hooks.
+
+        :param fd: File descriptor to write to from the exception hooks.
+            Defaults to stderr.
+        :param faulthandler_file: If given, the snapshot is kept up to date
+            in this file, and :mod:`faulthandler` is enabled to append tracebacks
+            of fatal errors (e.g. segfaults) to it.
+            If :mod:`faulthandler` was enabled before, :meth:`uninstall`
+            re-enables it writing to :data:`sys.stderr`
+            (the file it wrote to before can’t be queried).
+        :param refresh_interval: Seconds between refreshes in a daemon thread
+            (`None` to only refresh manually).
+        """
+        prev_sys, prev_threading = self._hooks = (sys.excepthook, threading.excepthook)
+
+        def excepthook(
+            typ: type[BaseException],
+            value: BaseException,
+            tb: TracebackType | None,
+        ) -> None:
+            self.write(fd)
+            prev_sys(typ, value, tb)
+
+        def threading_excepthook(args: threading.ExceptHookArgs) -> None:
+            self.write(fd)
+            prev_threading(args)
+
+        sys.excepthook = excepthook
+        threading.excepthook = threading_excepthook
+
+        if faulthandler_file is not None:
+            with self._lock:
+                self._side_file = faulthandler_file.open("w+b")
+                self._write_side_file(self._side_file)
+            self._faulthandler_was_enabled = faulthandler.is_enabled()
+            faulthandler.enable(file=self._side_file)
+
+        if refresh_interval is not None:
+            self._stop.clear()
+            threading.Thread(
+                target=self._refresh_loop,
+                args=(refresh_interval,),
+                name="session_info2-crash-snapshot",
+                daemon=True,
+            ).start()
+
+    def uninstall(self) -> None:
+        """Restore previous hooks and stop refreshing."""
+        self._stop.set()
+        if self._hooks is not None:
+            sys.excepthook, threading.excepthook = self._hooks
+            self._hooks = None
+        if self._side_file is not None:
+            faulthandler.disable()
+            if self._faulthandler_was_enabled:
+                # like pytest, fall back to the default file (sys.stderr)
+                with suppress(RuntimeError, ValueError, OSError):
+                    faulthandler.enable()
+            self._side_file.close()
+            self._side_file = None
+
+    def _refresh_loop(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            # An exception would end this thread and trigger our threading hook,
+            # which would report a crash that didn’t happen.
+            try:
+                self.refresh()
+            except Exception:  # noqa: PERF203
+                logger.warning("Failed to refresh crash snapshot", exc_info=True)
+
+
+def install_crash_hooks(
+    *,
+    fd: int | None = None,
+    faulthandler_file: Path | None = None,
+    refresh_interval: float | None = 30.0,
+    cpu: bool = True,
+    gpu: bool = False,
+) -> CrashSnapshot:
+    """Keep a pre-serialized snapshot and write it when the process crashes.
+
+    The work happens here and in periodic refreshes,
+    so nothing allocation-heavy has to be done at crash time.
+
+    :param fd: File descriptor the exception hooks write to. Defaults to stderr.
+    :param faulthandler_file: File kept up to date with the snapshot,
+        to which :mod:`faulthandler` appends tracebacks of fatal errors.
+    :param refresh_interval: Seconds between refreshes in a daemon thread
+        (`None` to only refresh manually).
+    :param cpu: Include number of CPU cores.
+    :param gpu: Include information per supported GPU.
+
+    :return: The snapshot, e.g. to :meth:`~CrashSnapshot.refresh` it manually.
+    """
+    snapshot = CrashSnapshot(cpu=cpu, gpu=gpu)
+    snapshot.install(
+        fd=fd, faulthandler_file=faulthandler_file, refresh_interval=refresh_interval
+    )
+    return snapshot
@@ -2,27 +2,249 @@
 from __future__ import annotations
 
 import re
-from importlib.metadata import Distribution, distributions
-from importlib.metadata import packages_distributions as pkgs_dists
+import sys
+import zipfile
+from collections import defaultdict
+from functools import lru_cache
+from importlib.machinery import all_suffixes
+from importlib.metadata import Distribution, PackagePath, distributions
+from itertools import groupby
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from ._timing import phase
+
 if TYPE_CHECKING:
-    from collections.abc import Generator, Mapping
+    from collections.abc import Callable, Generator, Iterable, Mapping
+    from os import PathLike
+
+    from ._timing import Timings
 
 
-def packages_distributions() -> Mapping[str, list[str]]:
+def packages_distributions(
+    path: Iterable[str | PathLike[str]] | None = None,
+    *,
+    timings: Timings | None = None,
+    index: dict[str, Distribution] | None = None,
+    keep: Callable[[str], bool] | None = None,
+) -> Mapping[str, list[str]]:
     """Return a mapping of top-level packages to their distributions.
 
     Unlike :func:`importlib.metadata.packages_distributions`,
-    this includes editable packages.
+    this includes editable packages and can scan arbitrary paths.
+
+    :param path: Directories to scan instead of :data:`sys.path`.
+    :param timings: Record time spent expanding editable installs.
+    :param index: Filled with the scanned distributions by name
+        (like :func:`importlib.metadata.distribution`, the first found wins),
+        so their metadata can be read later without searching for them again.
+    :param keep: Only include distributions for which this returns `True`,
+        e.g. a :class:`~session_info2.DistFilter`.
+        The files of other distributions aren’t read.
     """
-    pds = dict(pkgs_dists())
-    for dist in distributions():
-        for pkg_name in _top_level_editable(dist):
+    pds: defaultdict[str, list[str]] = defaultdict(list)
+    for dist in _distributions(path):
+        if keep is not None and not keep(dist.name):
+            continue
+        if index is not None:
+            index.setdefault(dist.name, dist)
+        for pkg_name in _top_level_declared(dist) or _top_level_inferred(dist):
+            pds[pkg_name].append(dist.name)
+        with phase(timings, "editable"):
+            editable = list(_top_level_editable(dist))
+        for pkg_name in editable:
             if "." not in pkg_name:  # apparently that’s what makes an importable name
-                pds.setdefault(pkg_name, []).append(dist.name)
-    return pds
+                pds[pkg_name].append(dist.name)
+    return dict(pds)
+
+
+def scan(
+    keep: Callable[[str], bool] | None = None, *, timings: Timings | None = None
+) -> tuple[Mapping[str, list[str]], dict[str, Distribution]]:
+    """Scan :data:`sys.path`, indexing distributions for later lookups.
+
+    :param keep: Only include distributions for which this returns `True`.
+    :param timings: Record time spent expanding editable installs.
+
+    :return: The result of :func:`packages_distributions`,
+        and the scanned distributions by name
+        (for :attr:`~session_info2.SessionInfo.dist_index`).
+    """
+    index: dict[str, Distribution] = {}
+    pkg2dists = packages_distributions(timings=timings, index=index, keep=keep)
+    return pkg2dists, index
+
+
+def installed_versions(
+    path: Iterable[str | PathLike[str]] | None = None,
+) -> dict[str, str]:
+    """Return a mapping of all installed distributions to their versions.
+
+    Like :func:`importlib.metadata.version`, the first distribution found wins.
+
+    :param path: Directories to scan instead of :data:`sys.path`.
+    """
+    versions: dict[str, str] = {}
+    for dist in _distributions(path):
+        versions.setdefault(dist.name, dist.version)
+    return versions
+
+
+def site_packages(prefix: Path) -> list[Path]:
+    """Find the site-packages directories of an environment.
+
+    :param prefix: Environment prefix (venv or conda env),
+        or a site-packages directory itself.
+    """
+    if prefix.name in {"site-packages", "dist-packages"} or any(
+        prefix.glob("*.dist-info")
+    ):
+        return [prefix]
+    return sorted(
+        {
+            p.resolve()
+            for pattern in ("lib*/python*/site-packages", "Lib/site-packages")
+            for p in prefix.glob(pattern)
+            if p.is_dir()
+        }
+    )
+
+
+_NAME_RE = re.compile(r"^Name:[ \t]*(\S+)[ \t]*$", re.MULTILINE)
+
+
+class ZipDistribution(Distribution):
+    """A distribution inside a zip archive (e.g. a zipapp or PEX file).
+
+    Metadata files are read straight from the archive on demand,
+    which is only kept open while reading.
+    """
+
+    def __init__(self, archive: str, meta_dir: str) -> None:
+        self._archive = archive
+        self._meta_dir = meta_dir
+        self._texts: dict[str, str | None] = {}
+
+    @property
+    def name(self) -> str:
+        """Distribution name, without parsing all of the metadata."""
+        meta = self.read_text("METADATA") or self.read_text("PKG-INFO") or ""
+        if m := _NAME_RE.search(meta.partition("\n\n")[0]):
+            return m[1]
+        return super().name
+
+    def read_text(self, filename: str | PathLike[str]) -> str | None:
+        """Read a metadata file, e.g. ``METADATA`` or ``RECORD``."""
+        # Scanning reads some files several times, so avoid decompressing them again.
+        filename = str(filename)
+        try:
+            return self._texts[filename]
+        except KeyError:
+            pass
+        try:
+            with zipfile.ZipFile(self._archive) as zf:
+                text = zf.read(f"{self._meta_dir}/{filename}").decode()
+        except (KeyError, OSError, zipfile.BadZipFile):
+            text = None
+        self._texts[filename] = text
+        return text
+
+    def locate_file(self, path: str | PathLike[str]) -> zipfile.Path:
+        """Locate a file listed in ``RECORD`` (relative to the archive entry)."""
+        root = self._meta_dir.rpartition("/")[0]
+        return zipfile.Path(self._archive, f"{root}/{path}" if root else str(path))
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self._archive}/{self._meta_dir}>"
+
+
+def _distributions(
+    path: Iterable[str | PathLike[str]] | None,
+) -> Iterable[Distribution]:
+    entries = sys.path if path is None else [str(p) for p in path]
+    if not any(_zip_location(e) for e in entries):
+        if path is None:
+            return distributions()
+        return distributions(path=entries)
+    return _distributions_mixed(entries)
+
+
+def _distributions_mixed(entries: Iterable[str]) -> Generator[Distribution, None, None]:
+    """Find distributions in directories and zip archives, in path order.
+
+    Zip archives are read using a cached index of their central directory
+    instead of :mod:`importlib.metadata`’s path finders,
+    which are slow for large archives.
+    """
+    for location, group in groupby(entries, key=_zip_location):
+        if location is None:
+            yield from distributions(path=list(group))
+            continue
+        archive, prefix = location
+        meta_dirs = _zip_meta_dirs(*_archive_key(archive))
+        for _ in group:
+            for meta_dir in meta_dirs:
+                if meta_dir.rpartition("/")[0] == prefix:
+                    yield ZipDistribution(archive, meta_dir)
+
+
+def _zip_location(entry: str) -> tuple[str, str] | None:
+    """Split a path entry into a zip archive and a directory inside it."""
+    path = Path(entry)
+    if not entry or path.is_dir():
+        return None
+    for archive in (path, *path.parents):
+        if archive.is_file():
+            inner = "" if archive == path else path.relative_to(archive).as_posix()
+            return str(archive), inner
+    return None
+
+
+def _archive_key(archive: str) -> tuple[str, int, int]:
+    # reopen archives that were replaced since they were indexed
+    try:
+        stat = Path(archive).stat()
+    except OSError:
+        return archive, 0, 0
+    return archive, stat.st_mtime_ns, stat.st_size
+
+
+@lru_cache(maxsize=256)
+def _zip_meta_dirs(archive: str, mtime_ns: int, size: int) -> tuple[str, ...]:
+    """Find the metadata directories in a zip archive.
+
+    Only the central directory is read, nothing is extracted,
+    and the archive is closed again afterwards.
+    """
+    del mtime_ns, size  # only used as cache key
+    try:
+        with zipfile.ZipFile(archive) as zf:
+            names = zf.namelist()
+    except (OSError, zipfile.BadZipFile):
+        return ()
+    meta_dirs = {
+        head: None
+        for name in names
+        if (head := name.rpartition("/")[0]).endswith((".dist-info", ".egg-info"))
+    }
+    return tuple(meta_dirs)
+
+
+def _top_level_declared(dist: Distribution) -> list[str]:
+    return (dist.read_text("top_level.txt") or "").split()
+
+
+def _top_level_inferred(dist: Distribution) -> set[str]:
+    """Infer top-level names from files (like Python 3.12+)."""
+    names = {_top_level_name(f) for f in dist.files or ()}
+    return {name for name in names if "." not in name and name != "__pycache__"}
+
+
+def _top_level_name(file: PackagePath) -> str:
+    if len(file.parts) > 1:
+        return file.parts[0]
+    suffix = next((s for s in all_suffixes() if file.name.endswith(s)), None)
+    return file.name.removesuffix(suffix) if suffix else file.name
 
 
 def _top_level_editable(dist: Distribution) -> Generator[str, None, None]:
@@ -31,9 +253,11 @@ def _top_level_editable(dist: Distribution) -> Generator[str, None, None]:
         if len(pth_file.parts) != 1 or pth_file.suffix != ".pth":
             continue
         for line in pth_file.read_text().splitlines():
-            if re.match(r"import\s", line):
+            if not line.strip() or line.startswith("#") or re.match(r"import\s", line):
                 continue  # https://docs.python.org/3/library/site.html
-            for p in Path(line).iterdir():
+            if not (root := Path(line.rstrip())).is_dir():
+                continue  # e.g. a zip archive
+            for p in root.iterdir():
                 yield from _find_top_level(p)
 
 
@@ -0,0 +1,53 @@
+# SPDX-License-Identifier: MPL-2.0
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from ._dists import installed_versions, site_packages
+from ._matrix import VersionMatrix
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from os import PathLike
+
+
+def scan_environments(
+    paths: Iterable[str | PathLike[str]],
+    *,
+    max_workers: int | None = None,
+    only_differing: bool = False,
+) -> VersionMatrix:
+    """Compare installed distributions of multiple environments.
+
+    Metadata is read directly from each environment’s site-packages,
+    without launching its interpreter.
+    Environments are scanned in parallel in a process pool.
+
+    :param paths: Environment prefixes (venvs or conda envs)
+        or site-packages directories.
+    :param max_workers: Maximum number of processes to scan with.
+    :param only_differing: Only show distributions that differ between environments.
+
+    :return: Version table with one column per environment.
+    """
+    prefixes = [Path(p) for p in paths]
+    columns: list[dict[str, str]]
+    if len(prefixes) <= 1 or max_workers == 1:
+        columns = [_scan_env(p) for p in prefixes]
+    else:
+        n = min(len(prefixes), max_workers or len(prefixes))
+        with ProcessPoolExecutor(n) as pool:
+            columns = list(pool.map(_scan_env, prefixes))
+    return VersionMatrix(
+        dict(zip(map(str, prefixes), columns, strict=True)),
+        only_differing=only_differing,
+    )
+
+
+def _scan_env(prefix: Path) -> dict[str, str]:
+    if not (sp := site_packages(prefix)):
+        msg = f"No site-packages directory found in {prefix}"
+        raise ValueError(msg)
+    return installed_versions(sp)
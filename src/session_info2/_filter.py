@@ -0,0 +1,166 @@
+# SPDX-License-Identifier: MPL-2.0
+from __future__ import annotations
+
+import os
+import re
+import warnings
+from dataclasses import dataclass, field
+from fnmatch import translate
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TypeAlias
+
+from ._graph import normalize
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+Pattern: TypeAlias = "str | re.Pattern[str]"
+
+ENV_INCLUDE = "SESSION_INFO2_INCLUDE"
+ENV_EXCLUDE = "SESSION_INFO2_EXCLUDE"
+CONFIG_TABLE = "session-info2"
+"""Table in ``pyproject.toml``, i.e. ``[tool.session-info2]``."""
+DEFAULT_EXCLUDE: tuple[Pattern, ...] = ("ipython", "session-info2")
+REGEX_PREFIX = "re:"
+
+
+@dataclass(frozen=True)
+class DistFilter:
+    """Select which distributions are reported.
+
+    Patterns are matched against normalized distribution names (:pep:`503`),
+    i.e. lowercase with runs of ``-``, ``_``, and ``.`` replaced by ``-``.
+    Strings are globs (normalized the same way, e.g. ``jupyter_*``),
+    unless prefixed with ``re:``.
+    Compiled regular expressions are used as is.
+    A distribution is reported if it matches `include` and doesn’t match `exclude`.
+    """
+
+    include: Sequence[Pattern] | None = None
+    """Patterns of distributions to report (`None` means all)."""
+    exclude: Sequence[Pattern] = DEFAULT_EXCLUDE
+    """Patterns of distributions to leave out."""
+
+    _include_res: tuple[re.Pattern[str], ...] | None = field(
+        init=False, repr=False, compare=False
+    )
+    _exclude_res: tuple[re.Pattern[str], ...] = field(
+        init=False, repr=False, compare=False
+    )
+    _memo: dict[str, bool] = field(
+        init=False, repr=False, compare=False, default_factory=dict
+    )
+
+    def __post_init__(self) -> None:
+        # compile once, so checking a distribution is just a few regex matches
+        include = None if self.include is None else _compile(self.include)
+        object.__setattr__(self, "_include_res", include)
+        object.__setattr__(self, "_exclude_res", _compile(self.exclude))
+
+    def __call__(self, dist: str) -> bool:
+        """Check if `dist` should be reported."""
+        try:
+            return self._memo[dist]
+        except KeyError:
+            pass
+        name = normalize(dist)
+        keep = (
+            self._include_res is None
+            or any(r.fullmatch(name) for r in self._include_res)
+        ) and not any(r.fullmatch(name) for r in self._exclude_res)
+        self._memo[dist] = keep
+        return keep
+
+    @classmethod
+    def resolve(
+        cls,
+        include: Iterable[Pattern] | None = None,
+        exclude: Iterable[Pattern] | None = None,
+        *,
+        config_dir: Path | None = None,
+    ) -> DistFilter:
+        """Create filter from arguments, environment variables, or config.
+
+        Each of `include` and `exclude` is taken from the first of:
+
+        1. the argument, if not `None`
+        2. the environment variable ``SESSION_INFO2_INCLUDE``/``…_EXCLUDE``
+           (comma-separated)
+        3. the ``include``/``exclude`` keys in the ``[tool.session-info2]`` table
+           of the ``pyproject.toml`` in `config_dir` (default: the working directory)
+           or its closest parent directory containing one
+           (on Python 3.10, this needs :mod:`tomli` to be installed)
+        4. the defaults (everything included, IPython and session-info2 excluded)
+        """
+        config: dict[str, Any] | None = None
+
+        def get(
+            key: str, arg: Iterable[Pattern] | None, env_var: str
+        ) -> tuple[Pattern, ...] | None:
+            nonlocal config
+            if arg is not None:
+                return tuple(arg)
+            if env := os.environ.get(env_var):
+                return tuple(p.strip() for p in env.split(",") if p.strip())
+            if config is None:
+                config = _read_config(config_dir or Path.cwd())
+            if (value := config.get(key)) is not None:
+                return tuple(value)
+            return None
+
+        include = get("include", include, ENV_INCLUDE)
+        if (exclude := get("exclude", exclude, ENV_EXCLUDE)) is None:
+            exclude = DEFAULT_EXCLUDE
+        return cls(include, exclude)
+
+
+def _compile(patterns: Iterable[Pattern]) -> tuple[re.Pattern[str], ...]:
+    return tuple(
+        p
+        if isinstance(p, re.Pattern)
+        else re.compile(p.removeprefix(REGEX_PREFIX))
+        if p.startswith(REGEX_PREFIX)
+        else re.compile(translate(normalize(p)))
+        for p in patterns
+    )
+
+
+def _read_config(start: Path) -> dict[str, Any]:
+    """Read ``[tool.session-info2]`` from the closest ``pyproject.toml``."""
+    for d in (start, *start.parents):
+        if (path := d / "pyproject.toml").is_file():
+            return _read_table(path)
+    return {}
+
+
+def _read_table(path: Path) -> dict[str, Any]:
+    try:
+        text = path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError) as e:
+        _warn_config(path, str(e))
+        return {}
+    try:
+        import tomllib
+    except ImportError:  # Python 3.10
+        try:
+            import tomli as tomllib  # type: ignore[no-redef,import-not-found,unused-ignore]
+        except ImportError:
+            if _CONFIG_TABLE_RE.search(text):
+                _warn_config(path, "install `tomli` to read it on Python 3.10")
+            return {}
+    try:
+        pyproject = tomllib.loads(text)
+    except tomllib.TOMLDecodeError as e:
+        _warn_config(path, str(e))
+        return {}
+    return pyproject.get("tool", {}).get(CONFIG_TABLE, {})  # type: ignore[no-any-return]
+
+
+_CONFIG_TABLE_RE = re.compile(
+    rf"^\s*\[\s*tool\s*\.\s*[\"']?{CONFIG_TABLE}\b", re.MULTILINE
+)
+
+
+def _warn_config(path: Path, reason: str) -> None:
+    msg = f"Could not read [tool.{CONFIG_TABLE}] from {path}: {reason}"
+    warnings.warn(msg, RuntimeWarning, stacklevel=6)
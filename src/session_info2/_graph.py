@@ -0,0 +1,273 @@
+# SPDX-License-Identifier: MPL-2.0
+from __future__ import annotations
+
+import ast
+import operator
+import re
+from dataclasses import dataclass
+from functools import cache, cached_property
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Generator, Iterable, Mapping
+    from importlib.metadata import Distribution
+
+
+_REQ_NAME = re.compile(r"\s*([A-Za-z0-9](?:[A-Za-z0-9._-]*[A-Za-z0-9])?)")
+
+
+def normalize(name: str) -> str:
+    """Normalize a distribution name (:pep:`503`)."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def parse_requirements(dist: Distribution) -> frozenset[str]:
+    """Get normalized names of distributions `dist` requires.
+
+    Parsed from ``Requires-Dist``.
+    Requirements of extras are skipped, since it’s unknown which were installed.
+    Other environment markers are evaluated if they consist of comparisons
+    joined by ``and``/``or`` (e.g. ``sys_platform == "win32"``),
+    and otherwise assumed to apply.
+    """
+    names = set()
+    for req in dist.requires or ():
+        spec, _, marker = req.partition(";")
+        if (m := _REQ_NAME.match(spec)) and _marker_applies(marker):
+            names.add(normalize(m[1]))
+    return frozenset(names)
+
+
+_EXTRA = re.compile(r"\bextra\b")
+_VERSION_VARS = frozenset({"python_version", "python_full_version"})
+_COMPARE_OPS: dict[type[ast.cmpop], Any] = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.In: lambda a, b: a in b,
+    ast.NotIn: lambda a, b: a not in b,
+}
+
+
+def _marker_applies(marker: str) -> bool:
+    """Evaluate an environment marker (:pep:`508`) for this interpreter."""
+    if not (marker := marker.strip()):
+        return True
+    if _EXTRA.search(marker):
+        return False
+    # simple markers are valid Python expressions, e.g. `a == "x" and b < "y"`
+    try:
+        return _evaluate(ast.parse(marker, mode="eval").body)
+    except (SyntaxError, ValueError, KeyError):
+        return True  # e.g. `~=`, which isn’t Python syntax
+
+
+def _evaluate(node: ast.expr) -> bool:
+    match node:
+        case ast.BoolOp(op=ast.And(), values=values):
+            return all(_evaluate(v) for v in values)
+        case ast.BoolOp(op=ast.Or(), values=values):
+            return any(_evaluate(v) for v in values)
+        case ast.Compare(left=left, ops=[op], comparators=[right]) if (
+            type(op) in _COMPARE_OPS
+        ):
+            lhs, rhs = _operand(left), _operand(right)
+            if {_var_name(left), _var_name(right)} & _VERSION_VARS and not isinstance(
+                op, ast.In | ast.NotIn
+            ):
+                return bool(_COMPARE_OPS[type(op)](*_version_tuples(lhs, rhs)))
+            return bool(_COMPARE_OPS[type(op)](lhs, rhs))
+    msg = f"Unsupported marker: {ast.unparse(node)}"
+    raise ValueError(msg)
+
+
+def _var_name(node: ast.expr) -> str | None:
+    return node.id if isinstance(node, ast.Name) else None
+
+
+def _operand(node: ast.expr) -> str:
+    match node:
+        case ast.Name(id=name):
+            return _marker_env()[name]
+        case ast.Constant(value=str(value)):
+            return value
+    msg = f"Unsupported marker operand: {ast.unparse(node)}"
+    raise ValueError(msg)
+
+
+def _version_tuples(a: str, b: str) -> tuple[tuple[int, ...], tuple[int, ...]]:
+    if not re.fullmatch(r"\d+(\.\d+)*", a) or not re.fullmatch(r"\d+(\.\d+)*", b):
+        msg = f"Unsupported version comparison: {a!r}, {b!r}"
+        raise ValueError(msg)
+    ta, tb = (tuple(map(int, v.split("."))) for v in (a, b))
+    n = max(len(ta), len(tb))
+    return ta + (0,) * (n - len(ta)), tb + (0,) * (n - len(tb))
+
+
+@cache
+def _marker_env() -> dict[str, str]:
+    """Values of environment marker variables for this interpreter."""
+    import os
+    import platform
+    import sys
+
+    return dict(
+        os_name=os.name,
+        sys_platform=sys.platform,
+        platform_machine=platform.machine(),
+        platform_python_implementation=platform.python_implementation(),
+        platform_release=platform.release(),
+        platform_system=platform.system(),
+        platform_version=platform.version(),
+        python_version=".".join(platform.python_version_tuple()[:2]),
+        python_full_version=platform.python_version(),
+        implementation_name=sys.implementation.name,
+    )
+
+
+@dataclass(frozen=True)
+class DependencyGraph:
+    """Requirements between loaded distributions."""
+
+    roots: tuple[str, ...]
+    """Imported distributions."""
+    requires: Mapping[str, tuple[str, ...]]
+    """Mapping of loaded distributions to the loaded distributions they require."""
+
+    @classmethod
+    def from_dists(
+        cls,
+        imported: Iterable[str],
+        loaded: Iterable[str],
+        requirements: Mapping[str, Collection[str]],
+    ) -> DependencyGraph:
+        """Build graph restricted to `imported` and `loaded` distributions.
+
+        :param requirements: Normalized names of the distributions each requires
+            (see :func:`parse_requirements`).
+            Distributions missing from this mapping have no requirements.
+        """
+        roots = tuple(imported)
+        by_norm = {normalize(d): d for d in (*roots, *loaded)}
+        requires = {
+            dist: tuple(
+                sorted(
+                    (
+                        by_norm[r]
+                        for r in requirements.get(dist, ())
+                        if r in by_norm and r != n
+                    ),
+                    key=str.casefold,
+                )
+            )
+            for n, dist in by_norm.items()
+        }
+        return cls(roots, requires)
+
+    @cached_property
+    def closure(self) -> Mapping[str, frozenset[str]]:
+        """Transitive requirements of each distribution.
+
+        Computed once for all distributions using strongly connected components,
+        so dependency cycles don’t cause repeated traversals.
+        """
+        closure: dict[str, frozenset[str]] = {}
+        # Tarjan’s algorithm emits components in reverse topological order,
+        # so all requirements of a component are done when it’s reached.
+        for component in _sccs(self.requires):
+            reach = set(component) if len(component) > 1 else set()
+            for dist in component:
+                for req in self.requires[dist]:
+                    if req not in component:
+                        reach |= {req, *closure[req]}
+            for dist in component:
+                closure[dist] = frozenset(reach - {dist})
+        return closure
+
+    @cached_property
+    def pulled_in_by(self) -> Mapping[str, tuple[str, ...]]:
+        """Mapping of non-imported distributions to imported ones requiring them."""
+        pulled: dict[str, list[str]] = {}
+        for root in self.roots:
+            for dist in self.closure[root]:
+                if dist not in self.roots:
+                    pulled.setdefault(dist, []).append(root)
+        return {d: tuple(rs) for d, rs in pulled.items()}
+
+    @cached_property
+    def orphans(self) -> tuple[str, ...]:
+        """Loaded distributions that no loaded distribution declares as requirement."""
+        required = {r for reqs in self.requires.values() for r in reqs}
+        return tuple(
+            sorted(
+                (d for d in self.requires if d not in required and d not in self.roots),
+                key=str.casefold,
+            )
+        )
+
+    def tree(self) -> Generator[tuple[int, str, bool], None, None]:
+        """Generate ``(depth, dist, repeated)`` for a tree per imported distribution.
+
+        Subtrees already shown are only listed once and marked as repeated.
+        """
+        shown: set[str] = set()
+
+        def walk(dist: str, depth: int) -> Generator[tuple[int, str, bool], None, None]:
+            repeated = dist in shown and bool(self.requires[dist])
+            yield depth, dist, repeated
+            if repeated:
+                return
+            shown.add(dist)
+            for req in self.requires[dist]:
+                yield from walk(req, depth + 1)
+
+        for root in self.roots:
+            yield from walk(root, 0)
+
+
+def _sccs(graph: Mapping[str, Collection[str]]) -> list[list[str]]:
+    """Find strongly connected components (iterative Tarjan’s algorithm)."""
+    index: dict[str, int] = {}
+    low: dict[str, int] = {}
+    stack: list[str] = []
+    on_stack: set[str] = set()
+    components: list[list[str]] = []
+    for start in graph:
+        if start in index:
+            continue
+        work = [(start, iter(graph[start]))]
+        index[start] = low[start] = len(index)
+        stack.append(start)
+        on_stack.add(start)
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child not in index:
+                    index[child] = low[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(graph[child])))
+                    break
+                if child in on_stack:
+                    low[node] = min(low[node], index[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    components.append(_pop_component(stack, on_stack, node))
+    return components
+
+
+def _pop_component(stack: list[str], on_stack: set[str], root: str) -> list[str]:
+    component = []
+    while True:
+        member = stack.pop()
+        on_stack.discard(member)
+        component.append(member)
+        if member == root:
+            return component
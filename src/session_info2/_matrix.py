@@ -0,0 +1,62 @@
+# SPDX-License-Identifier: MPL-2.0
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from functools import cached_property
+from typing import TYPE_CHECKING
+
+from ._repr import _fmt_markdown
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Mapping, Sequence
+
+
+@dataclass(frozen=True)
+class VersionMatrix:
+    """Versions of distributions across several environments.
+
+    Can be displayed as string (:meth:`__repr__`) or Markdown.
+    """
+
+    columns: Mapping[str, Mapping[str, str]]
+    """Mapping of environment labels to mappings of distributions to versions."""
+    only_differing: bool = False
+    """Whether to only show distributions that differ between environments."""
+
+    @cached_property
+    def dists(self) -> Sequence[str]:
+        """Sorted distribution names present in any environment."""
+        return sorted(
+            {d for col in self.columns.values() for d in col}, key=str.casefold
+        )
+
+    @cached_property
+    def differing(self) -> Mapping[str, tuple[str | None, ...]]:
+        """Distributions whose version or presence differs between environments."""
+        rows = (
+            (d, tuple(col.get(d) for col in self.columns.values())) for d in self.dists
+        )
+        return {d: vs for d, vs in rows if len(set(vs)) > 1}
+
+    def _rows(self) -> Generator[tuple[str, ...], None, None]:
+        for dist in self.differing if self.only_differing else self.dists:
+            vs = (col.get(dist) or "-" for col in self.columns.values())
+            yield ((f"{dist} *" if dist in self.differing else dist), *vs)
+
+    def __repr__(self) -> str:
+        """Generate string representation, marking differing distributions with `*`."""
+        header = ("Distribution", *self.columns)
+        return "\n".join("\t".join(row) for row in (header, *self._rows()))
+
+    def _repr_markdown_(self) -> str:
+        return _fmt_markdown(("Distribution", *self.columns), self._rows())
+
+    def to_json(self) -> str:
+        """Generate JSON representation."""
+        return json.dumps(
+            dict(
+                columns={label: dict(col) for label, col in self.columns.items()},
+                differing=list(self.differing),
+            )
+        )
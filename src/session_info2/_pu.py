@@ -5,8 +5,8 @@ import os
 import platform
 import shutil
 from multiprocessing import cpu_count
-from pathlib import WindowsPath
-from subprocess import CalledProcessError, run
+from pathlib import Path, WindowsPath
+from subprocess import CalledProcessError, TimeoutExpired, run
 
 
 def cpu_info() -> str:
@@ -15,37 +15,113 @@ def cpu_info() -> str:
     return f"{cpu_count()} logical CPU cores{f', {proc}' if proc else ''}"
 
 
-def gpu_info() -> tuple[str, ...]:
-    """Get GPU info."""
-    nvidia_smi: str | WindowsPath
-    if platform.system() == "Windows":
-        # If the platform is Windows and nvidia-smi
-        # could not be found from the environment path,
-        # try to find it from system drive with default installation path
-        nvidia_smi = shutil.which("nvidia-smi") or (
-            WindowsPath(os.environ["SYSTEMDRIVE"])
-            / r"\Program Files\NVIDIA Corporation\NVSMI\nvidia-smi.exe"
+# Instruction set extensions that numeric libraries dispatch on,
+# in the order they’re reported.
+ISA_FLAGS = (
+    # x86
+    "sse4_2",
+    "avx",
+    "avx2",
+    "fma",
+    "f16c",
+    "avx512f",
+    "avx512bw",
+    "avx512vl",
+    "avx512_vnni",
+    "avx512_bf16",
+    "amx_tile",
+    # ARM
+    "asimd",
+    "sve",
+    "sve2",
+    "i8mm",
+    "bf16",
+)
+
+
+def isa_flags(cpuinfo: Path = Path("/proc/cpuinfo")) -> tuple[str, ...]:
+    """Get notable instruction set extensions supported by the CPU.
+
+    :param cpuinfo: File in the format of Linux’ ``/proc/cpuinfo``.
+
+    :return: Supported extensions from :data:`ISA_FLAGS`
+        (empty if `cpuinfo` doesn’t exist, e.g. on other platforms).
+    """
+    try:
+        text = cpuinfo.read_text()
+    except OSError:
+        return ()
+    # x86 uses “flags”, ARM uses “Features”. Report the first core’s.
+    flags = next(
+        (
+            set(value.split())
+            for key, _, value in (line.partition(":") for line in text.splitlines())
+            if key.strip() in {"flags", "Features"}
+        ),
+        set(),
+    )
+    return tuple(flag for flag in ISA_FLAGS if flag in flags)
+
+
+def gpu_memory_used(*, timeout: float | None = None) -> int | None:
+    """Get memory used on all NVIDIA GPUs in bytes (`None` if unavailable).
+
+    :param timeout: Maximum number of seconds to wait for ``nvidia-smi``.
+    """
+    try:
+        p = run(
+            [
+                _nvidia_smi(),
+                "--query-gpu=memory.used",
+                "--format=csv,noheader,nounits",
+            ],
+            capture_output=True,
+            encoding="UTF-8",
+            check=True,
+            timeout=timeout,
         )
-    else:
-        nvidia_smi = "nvidia-smi"
+        return sum(int(line) for line in p.stdout.split()) * 2**20
+    except (CalledProcessError, FileNotFoundError, TimeoutExpired, ValueError):
+        return None
+
 
+def gpu_info(*, timeout: float | None = None) -> tuple[str, ...]:
+    """Get GPU info.
+
+    :param timeout: Maximum number of seconds to wait for ``nvidia-smi``.
+    """
     # Get ID, processing and memory utilization for all GPUs
     try:
         p = run(
             [
-                nvidia_smi,
+                _nvidia_smi(),
                 "--query-gpu=index,name,driver_version,memory.total",
                 "--format=csv,noheader",
             ],
             capture_output=True,
             encoding="UTF-8",
             check=True,
+            timeout=timeout,
         )
     except (CalledProcessError, FileNotFoundError):
         return ("No GPU found",)
+    except TimeoutExpired:
+        return (f"GPU probe timed out after {timeout}s",)
 
     device_infos = (line.split(", ") for line in p.stdout.splitlines())
     return tuple(
         f"ID: {id_}, {name}, Driver: {driver}, Memory: {memory}"
         for id_, name, driver, memory in device_infos
     )
+
+
+def _nvidia_smi() -> str | WindowsPath:
+    if platform.system() == "Windows":
+        # If the platform is Windows and nvidia-smi
+        # could not be found from the environment path,
+        # try to find it from system drive with default installation path
+        return shutil.which("nvidia-smi") or (
+            WindowsPath(os.environ["SYSTEMDRIVE"])
+            / r"\Program Files\NVIDIA Corporation\NVSMI\nvidia-smi.exe"
+        )
+    return "nvidia-smi"
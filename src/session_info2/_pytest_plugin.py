@@ -0,0 +1,171 @@
+# SPDX-License-Identifier: MPL-2.0
+"""Pytest plugin adding session info to terminal header and reports.
+
+Enable with ``--session-info`` or the ``session_info = true`` ini option.
+The snapshot is computed once in the controller process
+and shipped to :mod:`xdist` workers, which only compare a cheap fingerprint.
+
+Reports list installed rather than loaded distributions,
+since they are stamped before the code under test is imported
+(and the :mod:`xdist` controller never imports it).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sys
+import sysconfig
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from _pytest.terminal import TerminalReporter
+
+
+WORKERINPUT_SNAPSHOT = "session_info2"
+WORKERINPUT_FINGERPRINT = "session_info2_fingerprint"
+
+snapshot_key = pytest.StashKey[dict[str, Any]]()
+fingerprint_key = pytest.StashKey[str]()
+mismatches_key = pytest.StashKey[list[str]]()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("session-info2")
+    group.addoption(
+        "--session-info",
+        action="store_true",
+        default=None,
+        help=(
+            "add versions of installed distributions and system info to the "
+            "terminal header, JUnit XML and pytest-benchmark reports"
+        ),
+    )
+    parser.addini(
+        "session_info", type="bool", default=False, help="enable --session-info"
+    )
+
+
+def _enabled(config: pytest.Config) -> bool:
+    opt = config.getoption("session_info")
+    return bool(config.getini("session_info") if opt is None else opt)
+
+
+def _is_worker(config: pytest.Config) -> bool:
+    return hasattr(config, "workerinput")
+
+
+def _fingerprint() -> str:
+    """Cheaply identify the Python environment, without scanning metadata.
+
+    Uses the interpreter and modification times of its package directories,
+    which change when distributions are (un)installed.
+    """
+    dirs = sorted({sysconfig.get_path("purelib"), sysconfig.get_path("platlib")})
+    mtimes = [p.stat().st_mtime_ns if (p := Path(d)).is_dir() else None for d in dirs]
+    data = repr((sys.version, sys.executable, sys.prefix, dirs, mtimes)).encode()
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def _snapshot(config: pytest.Config) -> dict[str, Any]:
+    """Get the snapshot of installed distributions, computing it once per run."""
+    if (snapshot := config.stash.get(snapshot_key, None)) is not None:
+        return snapshot
+    from . import SessionInfo, _AdditionalInfo
+    from ._dists import scan
+    from ._filter import DistFilter
+
+    info = _AdditionalInfo(cpu=None, gpu=())
+    keep = DistFilter.resolve(config_dir=config.rootpath)
+    pkg2dists, dist_index = scan(keep)
+    si = SessionInfo(pkg2dists, {}, info=info, dist_filter=keep, dist_index=dist_index)
+    snapshot = config.stash[snapshot_key] = dict(
+        distributions=[
+            dict(package=d, version=si._version(d))  # noqa: SLF001
+            for d in sorted(dist_index, key=str.casefold)
+        ],
+        info=dict(info._table()),  # noqa: SLF001
+    )
+    return snapshot
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    if not _enabled(config):
+        return
+    config.stash[fingerprint_key] = _fingerprint()
+    config.stash[mismatches_key] = []
+    if not _is_worker(config):
+        return
+    workerinput: dict[str, Any] = config.workerinput  # type: ignore[attr-defined]
+    if (snapshot := workerinput.get(WORKERINPUT_SNAPSHOT)) is not None:
+        config.stash[snapshot_key] = json.loads(snapshot)
+    workeroutput: dict[str, Any] = config.workeroutput  # type: ignore[attr-defined]
+    workeroutput[WORKERINPUT_FINGERPRINT] = config.stash[fingerprint_key]
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node: Any) -> None:  # noqa: ANN401
+    """Ship snapshot and fingerprint to an :mod:`xdist` worker."""
+    config: pytest.Config = node.config
+    if not _enabled(config):
+        return
+    node.workerinput[WORKERINPUT_SNAPSHOT] = json.dumps(_snapshot(config))
+    node.workerinput[WORKERINPUT_FINGERPRINT] = config.stash[fingerprint_key]
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node: Any, error: object) -> None:  # noqa: ANN401
+    """Record if an :mod:`xdist` worker’s environment differs from the controller’s."""
+    del error
+    config: pytest.Config = node.config
+    if not _enabled(config):
+        return
+    workeroutput: dict[str, Any] = getattr(node, "workeroutput", {})
+    fingerprint = workeroutput.get(WORKERINPUT_FINGERPRINT)
+    if fingerprint is not None and fingerprint != config.stash[fingerprint_key]:
+        config.stash[mismatches_key].append(
+            f"{node.gateway.id}: Python environment differs from the controller’s, "
+            "versions in reports may be inaccurate"
+        )
+
+
+def pytest_report_header(config: pytest.Config) -> list[str]:
+    if not _enabled(config) or _is_worker(config):
+        return []
+    snapshot = _snapshot(config)
+    info = ", ".join(f"{k}: {v}" for k, v in snapshot["info"].items())
+    n = len(snapshot["distributions"])
+    return [f"session-info2: {n} installed distributions, {info}"]
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _session_info2_junit(
+    request: pytest.FixtureRequest,
+    record_testsuite_property: Callable[[str, object], None],
+) -> None:
+    """Add the snapshot to JUnit XML reports (not supported with :mod:`xdist`)."""
+    if _enabled(request.config):
+        record_testsuite_property("session_info", json.dumps(_snapshot(request.config)))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_benchmark_update_machine_info(
+    config: pytest.Config, machine_info: dict[str, Any]
+) -> None:
+    if _enabled(config):
+        machine_info["session_info"] = _snapshot(config)
+
+
+def pytest_terminal_summary(
+    terminalreporter: TerminalReporter, config: pytest.Config
+) -> None:
+    if not _enabled(config) or not (mismatches := config.stash[mismatches_key]):
+        return
+    terminalreporter.section("session-info2 warnings", yellow=True)
+    for msg in mismatches:
+        terminalreporter.line(msg, yellow=True)
@@ -7,6 +7,8 @@ from textwrap import dedent, indent
 from types import MappingProxyType
 from typing import TYPE_CHECKING, Any, Literal, TypeAlias
 
+from ._timing import phase
+
 if TYPE_CHECKING:
     from collections.abc import Callable, Container, Iterable, Mapping
 
@@ -34,10 +36,23 @@ def repr_markdown(si: SessionInfo) -> str:
         part
         for header, rows in si._table_parts().items()  # noqa: SLF001
         if (part := _fmt_markdown(header, rows))
-    )
+    ) + (f"\n\n{_fmt_markdown_graph(si)}" if si.dependency_graph else "")
+
+
+def _fmt_markdown_graph(si: SessionInfo) -> str:
+    graph = si.dep_graph
+    lines = [
+        f"{'  ' * depth}- {dist} {si._version(dist)}{' (*)' if repeated else ''}"  # noqa: SLF001
+        for depth, dist, repeated in graph.tree()
+    ]
+    if graph.orphans:
+        lines += ["", f"Loaded without declared requirer: {', '.join(graph.orphans)}"]
+    return "\n".join(["**Dependency graph**", "", *lines])
 
 
-def _fmt_markdown(header: _TableHeader, rows: Iterable[tuple[str, str]]) -> str:
+def _fmt_markdown(
+    header: _TableHeader | tuple[str, ...], rows: Iterable[tuple[str, ...]]
+) -> str:
     rows = list(rows)
     if not rows:
         return ""
@@ -60,10 +75,12 @@ def repr_html(si: SessionInfo) -> str:
             </details>
             """
         ).strip()
+    graph = _fmt_html_graph(si) if si.dependency_graph else ""
     return dedent(
         f"""
         {content}
         {deps if deps else ""}
+        {graph}
         <details>
             <summary>Copyable Markdown</summary>
             <pre>{repr_markdown(si)}</pre>
@@ -72,6 +89,26 @@ def repr_html(si: SessionInfo) -> str:
     ).strip()
 
 
+def _fmt_html_graph(si: SessionInfo) -> str:
+    graph = si.dep_graph
+    out: list[str] = []
+    prev = -1
+    for depth, dist, repeated in graph.tree():
+        if depth > prev:
+            out.append("<ul>")
+        else:
+            out.append("</li>" + "</ul></li>" * (prev - depth))
+        out.append(f"<li>{dist} {si._version(dist)}{' (*)' if repeated else ''}")  # noqa: SLF001
+        prev = depth
+    if prev >= 0:
+        out.append("</li>" + "</ul></li>" * prev + "</ul>")
+    if graph.orphans:
+        out.append(
+            f"<p>Loaded without declared requirer: {', '.join(graph.orphans)}</p>"
+        )
+    return f"<details>\n<summary>Dependency graph</summary>\n{''.join(out)}\n</details>"
+
+
 def repr_html_parts(si: SessionInfo) -> tuple[str, str | None]:
     """Generate parts for HTML representation."""
     parts = {
@@ -128,11 +165,31 @@ def repr_json(si: SessionInfo) -> str:
                 if ("Dependency", "Version") in parts
                 else {}
             ),
+            **(
+                dict(builds={d: b.as_dict() for d, b in si.builds.items()})
+                if si.build_variants
+                else {}
+            ),
             info=dict(parts["Component", "Info"]),
+            **(
+                dict(dependency_graph=_repr_json_graph(si))
+                if si.dependency_graph
+                else {}
+            ),
+            **(dict(timings=si.timings.as_dict()) if si.timings else {}),
         ),
     )
 
 
+def _repr_json_graph(si: SessionInfo) -> dict[str, Any]:
+    graph = si.dep_graph
+    return dict(
+        requires={d: list(reqs) for d, reqs in graph.requires.items()},
+        pulled_in_by={d: list(roots) for d, roots in graph.pulled_in_by.items()},
+        orphans=list(graph.orphans),
+    )
+
+
 def _repr_json_part(rows: Iterable[tuple[str, str]]) -> list[dict[str, str]]:
     return [dict(package=k, version=v) for k, v in rows]
 
@@ -176,11 +233,12 @@ def repr_mimebundle(
         if mime in DEFAULT_EXCLUDE and (include is None or mime not in include):
             continue
         try:
-            mb[mime] = repr_fn(si)
+            with phase(si.timings, f"render:{mime}"):
+                mb[mime] = repr_fn(si)
         except ImportError as e:
             msg = (
                 f"Failed to import dependencies for {mime} representation. "
                 f"({type(e).__name__}: {e})"
             )
-            warnings.warn(msg, RuntimeWarning, stacklevel=8)
+            warnings.warn(msg, RuntimeWarning, stacklevel=9)
     return mb
@@ -0,0 +1,45 @@
+# SPDX-License-Identifier: MPL-2.0
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+
+class DistResolver:
+    """Resolve module names to the distributions providing them.
+
+    Uses the longest prefix of a module name that is a key in `pkg2dists`,
+    e.g. ``namespace.package.sub`` resolves via ``namespace.package``
+    before trying ``namespace``.
+    Results are memoized, so resolving many objects from the same few modules
+    (as in a typical notebook namespace) costs one lookup per module.
+
+    :param pkg2dists: Mapping of (top-level) package names to distributions,
+        e.g. from :func:`importlib.metadata.packages_distributions`.
+    :param maxsize: Maximum number of module names to remember.
+    """
+
+    def __init__(
+        self, pkg2dists: Mapping[str, Sequence[str]], *, maxsize: int = 1024
+    ) -> None:
+        self.pkg2dists = pkg2dists
+        # Only try prefix lengths that exist, deepest first.
+        self._depths = sorted({k.count(".") + 1 for k in pkg2dists}, reverse=True)
+        self._resolve = lru_cache(maxsize=maxsize)(self._lookup)
+
+    def __call__(self, mod_name: str) -> str | None:
+        """Get the distribution providing `mod_name` (`None` if unknown)."""
+        return self._resolve(mod_name)
+
+    def _lookup(self, mod_name: str) -> str | None:
+        parts = mod_name.split(".")
+        for depth in self._depths:
+            if depth > len(parts):
+                continue
+            prefix = mod_name if depth == len(parts) else ".".join(parts[:depth])
+            if dists := self.pkg2dists.get(prefix):
+                return dists[0]
+        return None
@@ -0,0 +1,255 @@
+# SPDX-License-Identifier: MPL-2.0
+"""Sample resource usage in the background.
+
+Start with :func:`start_sampler`. While it runs, session info reports include
+peak and mean memory, CPU, and (optionally) GPU memory usage.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from itertools import pairwise
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Sequence
+    from typing import Any, Self
+
+DEFAULT_INTERVAL = 1.0
+DEFAULT_SIZE = 3600
+"""Number of samples kept (one hour at the default interval)."""
+
+_lock = threading.Lock()
+_active: ResourceSampler | None = None
+
+
+@dataclass(frozen=True)
+class ResourceSample:
+    """Resource usage of this process at one point in time."""
+
+    time: float
+    """Monotonic clock time in seconds."""
+    rss: int | None
+    """Resident set size in bytes."""
+    rss_peak: int | None
+    """Peak resident set size since process start in bytes."""
+    cpu_time: float | None
+    """CPU time (user + system) since process start in seconds."""
+    gpu_memory: int | None = None
+    """Memory used on all GPUs in bytes (by any process)."""
+
+
+class ResourceSampler:
+    """Sample resource usage into a ring buffer from a background thread.
+
+    Memory and CPU time are read from ``/proc/self/status`` and ``/proc/self/stat``
+    (so they’re only available on Linux), GPU memory from ``nvidia-smi``.
+
+    :param interval: Seconds between samples.
+    :param size: Maximum number of samples kept. Older ones are discarded.
+    :param gpu: Also sample GPU memory. This runs ``nvidia-smi`` for each sample.
+    :param proc: Mount point of the proc filesystem.
+    """
+
+    def __init__(
+        self,
+        *,
+        interval: float = DEFAULT_INTERVAL,
+        size: int = DEFAULT_SIZE,
+        gpu: bool = False,
+        proc: Path = Path("/proc"),
+    ) -> None:
+        self.interval = interval
+        self.gpu = gpu
+        self.proc = proc
+        self._samples: deque[ResourceSample] = deque(maxlen=size)
+        self._samples_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        try:
+            self._clock_ticks = os.sysconf("SC_CLK_TCK")
+        except (AttributeError, ValueError, OSError):  # pragma: no cover
+            self._clock_ticks = 100
+
+    @property
+    def samples(self) -> tuple[ResourceSample, ...]:
+        """Samples taken so far, oldest first."""
+        with self._samples_lock:
+            return tuple(self._samples)
+
+    @property
+    def running(self) -> bool:
+        """Whether the background thread is sampling."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def sample(self) -> ResourceSample:
+        """Take a sample now and add it to the buffer."""
+        rss, rss_peak = self._read_status()
+        s = ResourceSample(
+            time.monotonic(), rss, rss_peak, self._read_cpu_time(), self._read_gpu()
+        )
+        with self._samples_lock:
+            self._samples.append(s)
+        return s
+
+    def start(self) -> Self:
+        """Start sampling in a daemon thread."""
+        if not self.running:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="session_info2-sampler", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop sampling (samples are kept)."""
+        global _active  # noqa: PLW0603
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        with _lock:
+            if _active is self:
+                _active = None
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(self, *_: object) -> None:
+        self.stop()
+
+    def stats(self) -> dict[str, Any]:
+        """Summarize samples as peak and mean values.
+
+        :return: Number of ``samples``, their time span in ``seconds``,
+            and, where available, ``rss``, ``cpu`` (1.0 = one core),
+            and ``gpu_memory``, each as a :class:`dict` with ``peak`` and ``mean``.
+        """
+        return _stats(self.samples)
+
+    def _table(self) -> Generator[tuple[str, str], None, None]:
+        stats = self.stats()
+        if rss := stats.get("rss"):
+            yield (
+                "Memory",
+                f"peak {fmt_bytes(rss['peak'])}, mean {fmt_bytes(rss['mean'])}",
+            )
+        if cpu := stats.get("cpu"):
+            yield ("CPU usage", f"peak {cpu['peak']:.0%}, mean {cpu['mean']:.0%}")
+        if gpu := stats.get("gpu_memory"):
+            yield (
+                "GPU memory",
+                f"peak {fmt_bytes(gpu['peak'])}, mean {fmt_bytes(gpu['mean'])}",
+            )
+        if stats["samples"]:
+            yield ("Sampled", f"{stats['samples']} times over {stats['seconds']:.0f}s")
+
+    def _run(self) -> None:
+        while True:
+            self.sample()
+            if self._stop.wait(self.interval):
+                return
+
+    def _read_status(self) -> tuple[int | None, int | None]:
+        try:
+            text = (self.proc / "self" / "status").read_text()
+        except OSError:
+            return None, None
+        fields = {
+            key: value.split()
+            for key, _, value in (line.partition(":") for line in text.splitlines())
+            if key in {"VmRSS", "VmHWM"}
+        }
+
+        def kib(key: str) -> int | None:
+            value = fields.get(key)
+            return int(value[0]) * 1024 if value else None
+
+        return kib("VmRSS"), kib("VmHWM")
+
+    def _read_cpu_time(self) -> float | None:
+        try:
+            text = (self.proc / "self" / "stat").read_text()
+        except OSError:
+            return None
+        # The command name (field 2) can contain spaces and parentheses,
+        # so split after its closing parenthesis. utime and stime are fields 14-15.
+        fields = text.rpartition(")")[2].split()
+        try:
+            ticks = int(fields[11]) + int(fields[12])
+        except (IndexError, ValueError):
+            return None
+        return ticks / self._clock_ticks
+
+    def _read_gpu(self) -> int | None:
+        if not self.gpu:
+            return None
+        from ._pu import gpu_memory_used
+
+        return gpu_memory_used(timeout=self.interval)
+
+
+def start_sampler(
+    *,
+    interval: float = DEFAULT_INTERVAL,
+    size: int = DEFAULT_SIZE,
+    gpu: bool = False,
+) -> ResourceSampler:
+    """Start sampling resource usage of this process in the background.
+
+    While the sampler is running, reports created by :func:`session_info`
+    include peak and mean memory, CPU, and GPU memory usage.
+    Reading the samples is cheap, so this can run for the whole session.
+
+    Calling this while a sampler is running returns that sampler.
+
+    :param interval: Seconds between samples.
+    :param size: Maximum number of samples kept. Older ones are discarded.
+    :param gpu: Also sample memory used on NVIDIA GPUs.
+
+    :return: The running sampler. Call :meth:`~ResourceSampler.stop` to stop it.
+    """
+    global _active  # noqa: PLW0603
+    with _lock:
+        if _active is None:
+            _active = ResourceSampler(interval=interval, size=size, gpu=gpu).start()
+        return _active
+
+
+def active_sampler() -> ResourceSampler | None:
+    """Get the sampler started by :func:`start_sampler`, if it’s running."""
+    return _active
+
+
+def _stats(samples: Sequence[ResourceSample]) -> dict[str, Any]:
+    stats: dict[str, Any] = dict(
+        samples=len(samples),
+        seconds=samples[-1].time - samples[0].time if samples else 0.0,
+    )
+    if rss := [s.rss for s in samples if s.rss is not None]:
+        # The kernel’s high-water mark also catches peaks between samples.
+        peaks = [s.rss_peak for s in samples if s.rss_peak is not None]
+        stats["rss"] = dict(peak=max(rss + peaks), mean=sum(rss) / len(rss))
+    cpu = [(s.time, s.cpu_time) for s in samples if s.cpu_time is not None]
+    if usage := [
+        (c1 - c0) / (t1 - t0) for (t0, c0), (t1, c1) in pairwise(cpu) if t1 > t0
+    ]:
+        (t0, c0), (t1, c1) = cpu[0], cpu[-1]
+        stats["cpu"] = dict(peak=max(usage), mean=(c1 - c0) / (t1 - t0))
+    if gpu := [s.gpu_memory for s in samples if s.gpu_memory is not None]:
+        stats["gpu_memory"] = dict(peak=max(gpu), mean=sum(gpu) / len(gpu))
+    return stats
+
+
+def fmt_bytes(n: float) -> str:
+    """Format a number of bytes with a binary unit, e.g. ``1.5 GiB``."""
+    for unit in ["B", "KiB", "MiB", "GiB"]:
+        if n < 1024:  # noqa: PLR2004
+            return f"{n:.1f} {unit}" if unit != "B" else f"{n:.0f} B"
+        n /= 1024
+    return f"{n:.1f} TiB"
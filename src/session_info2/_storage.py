@@ -0,0 +1,157 @@
+# SPDX-License-Identifier: MPL-2.0
+"""Storage and memory configuration, read from procfs and sysfs (Linux only)."""
+
+from __future__ import annotations
+
+import os
+import re
+import sysconfig
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import TYPE_CHECKING
+
+from ._sampler import fmt_bytes
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Mapping, Sequence
+
+
+@dataclass(frozen=True)
+class Mount:
+    """A mounted filesystem (from ``/proc/self/mountinfo``)."""
+
+    point: PurePosixPath
+    """Where it’s mounted."""
+    fs_type: str
+    """Filesystem type, e.g. ``ext4``, ``tmpfs``, or ``nfs4``."""
+    source: str
+    """Mounted device or remote location."""
+
+    def __str__(self) -> str:
+        """Summarize in one line."""
+        return f"{self.fs_type} ({self.source} on {self.point})"
+
+
+@dataclass(frozen=True)
+class StorageInfo:
+    """Filesystems of relevant directories, and memory configuration."""
+
+    paths: Mapping[str, Mount | None] = field(default_factory=dict)
+    """Mounts containing the working, temporary, and site-packages directories."""
+    memory: Mapping[str, int] = field(default_factory=dict)
+    """Fields of ``/proc/meminfo`` in bytes (e.g. ``MemTotal``, ``SwapFree``)."""
+    transparent_hugepages: str | None = None
+    """Transparent hugepage mode, e.g. ``always``, ``madvise``, or ``never``."""
+
+    @classmethod
+    def read(
+        cls, root: Path = Path("/"), paths: Mapping[str, str] | None = None
+    ) -> StorageInfo:
+        """Read storage and memory information.
+
+        :param root: Directory containing the ``proc`` and ``sys`` filesystems.
+        :param paths: Directories to find mounts for, by label
+            (default: working, temporary, and site-packages directories).
+        """
+        if paths is None:
+            paths = _default_paths()
+        mounts = _read_mounts(root / "proc" / "self" / "mountinfo")
+        return cls(
+            paths={
+                label: _find_mount(PurePosixPath(os.path.realpath(p)), mounts)
+                for label, p in paths.items()
+            },
+            memory=_read_meminfo(root / "proc" / "meminfo"),
+            transparent_hugepages=_read_thp(
+                root / "sys" / "kernel" / "mm" / "transparent_hugepage" / "enabled"
+            ),
+        )
+
+    def _table(self) -> Generator[tuple[str, str], None, None]:
+        for label, mount in self.paths.items():
+            if mount is not None:
+                yield (label, str(mount))
+        if "MemTotal" in self.memory:
+            available = self.memory.get("MemAvailable")
+            yield (
+                "RAM",
+                f"{fmt_bytes(self.memory['MemTotal'])} total"
+                + (f", {fmt_bytes(available)} available" if available else ""),
+            )
+        if "SwapTotal" in self.memory:
+            total, free = self.memory["SwapTotal"], self.memory.get("SwapFree", 0)
+            yield (
+                "Swap",
+                f"{fmt_bytes(total)} total, {fmt_bytes(free)} free"
+                if total
+                else "none",
+            )
+        if self.transparent_hugepages:
+            yield ("Transparent hugepages", self.transparent_hugepages)
+
+
+def _default_paths() -> dict[str, str]:
+    paths = {
+        "Working directory": os.getcwd(),  # noqa: PTH109
+        "Temporary directory": tempfile.gettempdir(),
+        "site-packages": sysconfig.get_path("purelib"),
+    }
+    if (platlib := sysconfig.get_path("platlib")) != paths["site-packages"]:
+        paths["site-packages (platlib)"] = platlib
+    return paths
+
+
+def _read_mounts(mountinfo: Path) -> list[Mount]:
+    """Parse mounts (https://man7.org/linux/man-pages/man5/proc_pid_mountinfo.5.html)."""
+    try:
+        text = mountinfo.read_text()
+    except OSError:
+        return []
+    mounts = []
+    for line in text.splitlines():
+        # optional fields are terminated by a single hyphen
+        before, sep, after = line.partition(" - ")
+        fields, rest = before.split(), after.split()
+        if not sep or len(fields) < 5 or len(rest) < 2:  # noqa: PLR2004
+            continue
+        point = PurePosixPath(_unescape(fields[4]))
+        mounts.append(Mount(point, rest[0], _unescape(rest[1])))
+    return mounts
+
+
+def _unescape(s: str) -> str:
+    r"""Decode octal escapes like ``\040`` for space."""
+    return re.sub(r"\\([0-7]{3})", lambda m: chr(int(m[1], 8)), s)
+
+
+def _find_mount(path: PurePosixPath, mounts: Sequence[Mount]) -> Mount | None:
+    """Find the mount containing `path` (the last one mounted, if stacked)."""
+    candidates = [m for m in mounts if path == m.point or m.point in path.parents]
+    return max(reversed(candidates), key=lambda m: len(m.point.parts), default=None)
+
+
+def _read_meminfo(meminfo: Path) -> dict[str, int]:
+    try:
+        text = meminfo.read_text()
+    except OSError:
+        return {}
+    memory = {}
+    for line in text.splitlines():
+        key, _, value = line.partition(":")
+        match value.split():
+            case [n, "kB"]:
+                memory[key] = int(n) * 1024
+            case [n]:
+                memory[key] = int(n)
+    return memory
+
+
+def _read_thp(enabled: Path) -> str | None:
+    """Read the selected mode, e.g. ``[always] madvise never``."""
+    try:
+        text = enabled.read_text()
+    except OSError:
+        return None
+    match = re.search(r"\[(\w+)\]", text)
+    return match[1] if match else None
@@ -0,0 +1,61 @@
+# SPDX-License-Identifier: MPL-2.0
+"""Helpers for using session info from multiple threads."""
+
+from __future__ import annotations
+
+from functools import cached_property
+from typing import TYPE_CHECKING, Generic, TypeVar, overload
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from threading import RLock
+    from typing import Self
+
+
+K = TypeVar("K")
+V = TypeVar("V")
+R = TypeVar("R")
+
+_RETRIES = 8
+
+
+class once_property(cached_property[R], Generic[R]):  # noqa: N801
+    """A :class:`~functools.cached_property` that is computed only once.
+
+    Since Python 3.12, :class:`~functools.cached_property` doesn’t lock,
+    so concurrent first accesses all run the getter.
+    This serializes first accesses on the instance’s reentrant ``_lock``
+    (so properties can depend on each other),
+    while later accesses read the instance ``__dict__`` without locking.
+    """
+
+    @overload
+    def __get__(self, instance: None, owner: type | None = None) -> Self: ...
+    @overload
+    def __get__(self, instance: object, owner: type | None = None) -> R: ...
+    def __get__(self, instance: object | None, owner: type | None = None) -> Self | R:
+        if instance is None:
+            return self
+        assert self.attrname is not None  # noqa: S101
+        cache = instance.__dict__
+        try:
+            return cache[self.attrname]  # type: ignore[no-any-return]
+        except KeyError:
+            pass
+        lock: RLock = cache["_lock"]
+        with lock:
+            return super().__get__(instance, owner)
+
+
+def snapshot(mapping: Mapping[K, V]) -> dict[K, V]:
+    """Copy a mapping that other threads might modify, e.g. :data:`sys.modules`.
+
+    Copying a :class:`dict` is atomic, other mappings are retried
+    if they change size during iteration.
+    """
+    for _ in range(_RETRIES - 1):
+        try:
+            return dict(mapping)
+        except RuntimeError:  # noqa: PERF203  # changed size during iteration
+            continue
+    return dict(mapping)
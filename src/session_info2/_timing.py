@@ -0,0 +1,82 @@
+# SPDX-License-Identifier: MPL-2.0
+from __future__ import annotations
+
+import os
+import time
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator
+
+    SpanHook = Callable[[str, float, float], object]
+
+
+ENV_VAR = "SESSION_INFO2_TIMINGS"
+
+_NO_TIMING = nullcontext()
+
+
+@dataclass
+class PhaseTiming:
+    """Accumulated timing of one phase."""
+
+    calls: int = 0
+    """Number of times the phase was entered."""
+    seconds: float = 0.0
+    """Total wall time spent in the phase."""
+
+
+@dataclass
+class Timings:
+    """Wall time and call counts per phase of collecting and rendering session info.
+
+    Phases are e.g. ``scan`` (distribution metadata), ``editable`` (``.pth`` files),
+    ``os``, ``cpu``, ``gpu`` (``nvidia-smi``), ``attribution``, ``version``,
+    and ``render:<mime type>``.
+    """
+
+    hook: SpanHook | None = field(default=None, compare=False)
+    """Called with phase name, start, and end time (:func:`time.perf_counter`)
+    of each span, e.g. to forward them to a tracer.
+    """
+    phases: dict[str, PhaseTiming] = field(default_factory=dict)
+    """Mapping of phase names to their timings."""
+
+    @contextmanager
+    def phase(self, name: str) -> Generator[None, None, None]:
+        """Time a span of phase `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            p = self.phases.setdefault(name, PhaseTiming())
+            p.calls += 1
+            p.seconds += end - start
+            if self.hook is not None:
+                self.hook(name, start, end)
+
+    def as_dict(self) -> dict[str, dict[str, float]]:
+        """Convert to JSON-compatible dict."""
+        return {
+            name: dict(calls=p.calls, seconds=p.seconds)
+            for name, p in self.phases.items()
+        }
+
+
+def phase(timings: Timings | None, name: str) -> AbstractContextManager[None]:
+    """Time a span if `timings` is enabled, otherwise do nothing."""
+    if timings is None:
+        return _NO_TIMING
+    return timings.phase(name)
+
+
+def resolve(timings: bool | Timings | None) -> Timings | None:  # noqa: FBT001
+    """Create :class:`Timings` if enabled by argument or environment variable."""
+    if isinstance(timings, Timings):
+        return timings
+    if timings is None:
+        timings = os.environ.get(ENV_VAR, "").lower() not in {"", "0", "false"}
+    return Timings() if timings else None
@@ -0,0 +1,180 @@
+# SPDX-License-Identifier: MPL-2.0
+"""Read the state of git checkouts without running ``git``."""
+
+from __future__ import annotations
+
+import os
+import struct
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from pathlib import Path
+
+# https://git-scm.com/docs/index-format
+_INDEX_HEADER = struct.Struct(">4sLL")
+_INDEX_ENTRY = struct.Struct(">LLLLLLLLLL20sH")
+_FLAG_ASSUME_VALID = 0x8000
+_FLAG_EXTENDED = 0x4000
+_FLAG_SKIP_WORKTREE = 0x4000  # in the extended flags
+_MODE_GITLINK = 0o160000
+_MAX_SYMREF_DEPTH = 5
+DIRTY_CHECK_MAX_FILES = 10_000
+"""Checkouts with more tracked files aren’t checked for changes (too slow)."""
+
+
+@dataclass(frozen=True)
+class GitState:
+    """State of a git checkout."""
+
+    commit: str | None
+    """Hash of the checked out commit (`None` for a branch without commits)."""
+    branch: str | None
+    """Checked out branch (`None` if detached)."""
+    dirty: bool | None
+    """Whether tracked files were changed (`None` if unknown).
+
+    Like ``git diff --quiet`` without refreshing the index:
+    a file counts as changed if its size or modification time
+    differ from what the index recorded.
+    """
+
+    def __str__(self) -> str:
+        """Summarize in one line."""
+        commit = self.commit[:12] if self.commit else "no commits"
+        branch = f" on {self.branch}" if self.branch else ""
+        dirty = {True: ", dirty", False: "", None: ", dirty: unknown"}[self.dirty]
+        return f"git: {commit}{branch}{dirty}"
+
+
+def find_repo(path: Path) -> Path | None:
+    """Find the root of the git checkout containing `path`."""
+    for parent in (path, *path.parents):
+        if (parent / ".git").exists():
+            return parent
+    return None
+
+
+def git_state(root: Path, *, max_files: int = DIRTY_CHECK_MAX_FILES) -> GitState | None:
+    """Read state of the git checkout at `root`.
+
+    This isn’t cached, since files can change at any time.
+    :class:`~session_info2.SessionInfo` reads each checkout once per report.
+
+    :param max_files: Only check for changed files if at most this many are tracked,
+        since each has to be checked (otherwise :attr:`GitState.dirty` is `None`).
+
+    :return: `None` if `root` isn’t a readable git checkout.
+    """
+    try:
+        git_dir = _git_dir(root)
+        head = (git_dir / "HEAD").read_text().strip()
+    except OSError:
+        return None
+    common_dir = _common_dir(git_dir)
+    branch = None
+    commit: str | None = head
+    if head.startswith("ref: "):
+        ref = head.removeprefix("ref: ")
+        branch = ref.removeprefix("refs/heads/")
+        commit = _resolve_ref(git_dir, common_dir, ref)
+    return GitState(commit, branch, _is_dirty(root, git_dir / "index", max_files))
+
+
+def _git_dir(root: Path) -> Path:
+    """Find the git directory, following ``gitdir:`` files (worktrees, submodules)."""
+    dot_git = root / ".git"
+    if dot_git.is_dir():
+        return dot_git
+    text = dot_git.read_text().strip()
+    if not text.startswith("gitdir: "):
+        msg = f"Not a git directory: {dot_git}"
+        raise OSError(msg)
+    return root / text.removeprefix("gitdir: ")
+
+
+def _common_dir(git_dir: Path) -> Path:
+    """Find the directory containing shared refs (different for worktrees)."""
+    try:
+        return git_dir / (git_dir / "commondir").read_text().strip()
+    except OSError:
+        return git_dir
+
+
+def _resolve_ref(git_dir: Path, common_dir: Path, ref: str) -> str | None:
+    for _ in range(_MAX_SYMREF_DEPTH):
+        for d in dict.fromkeys([git_dir, common_dir]):
+            try:
+                value = (d / ref).read_text().strip()
+            except OSError:
+                continue
+            break
+        else:
+            return _packed_refs(common_dir).get(ref)
+        if not value.startswith("ref: "):
+            return value
+        ref = value.removeprefix("ref: ")
+    return None
+
+
+def _packed_refs(common_dir: Path) -> dict[str, str]:
+    try:
+        text = (common_dir / "packed-refs").read_text()
+    except OSError:
+        return {}
+    return {
+        ref: sha
+        for line in text.splitlines()
+        if line and line[0] not in "#^"
+        for sha, _, ref in [line.partition(" ")]
+    }
+
+
+def _is_dirty(root: Path, index: Path, max_files: int) -> bool | None:
+    try:
+        data = index.read_bytes()
+    except FileNotFoundError:
+        return False  # nothing tracked yet
+    except OSError:
+        return None
+    try:
+        if _INDEX_HEADER.unpack_from(data)[2] > max_files:
+            return None
+        return any(
+            _entry_changed(root / path, mtime, size)
+            for path, mtime, size in _index_entries(data)
+        )
+    except (ValueError, struct.error):
+        return None  # unsupported (e.g. version 4) or corrupt index
+
+
+def _index_entries(data: bytes) -> Generator[tuple[str, int, int], None, None]:
+    """Parse tracked paths with modification time (s) and size from a git index."""
+    signature, version, n_entries = _INDEX_HEADER.unpack_from(data)
+    if signature != b"DIRC" or version not in {2, 3}:
+        msg = f"Unsupported git index (version {version})"
+        raise ValueError(msg)
+    offset = _INDEX_HEADER.size
+    for _ in range(n_entries):
+        fields = _INDEX_ENTRY.unpack_from(data, offset)
+        mtime, mode, size, flags = fields[2], fields[6], fields[9], fields[11]
+        path_start = offset + _INDEX_ENTRY.size
+        skip = bool(flags & _FLAG_ASSUME_VALID) or mode == _MODE_GITLINK
+        if flags & _FLAG_EXTENDED:
+            (ext_flags,) = struct.unpack_from(">H", data, path_start)
+            skip |= bool(ext_flags & _FLAG_SKIP_WORKTREE)
+            path_start += 2
+        path_end = data.index(b"\0", path_start)
+        # entries are NUL-padded to a multiple of 8 bytes
+        offset += (path_end - offset + 8) & ~7
+        if not skip:
+            yield os.fsdecode(data[path_start:path_end]), mtime, size
+
+
+def _entry_changed(path: Path, mtime: int, size: int) -> bool:
+    try:
+        st = path.lstat()
+    except OSError:
+        return True  # deleted
+    return int(st.st_mtime) != mtime or st.st_size & 0xFFFFFFFF != size
@@ -0,0 +1,146 @@
+# SPDX-License-Identifier: MPL-2.0
+from __future__ import annotations
+
+import hashlib
+import os
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import cached_property, lru_cache, partial
+from typing import TYPE_CHECKING
+
+from ._matrix import VersionMatrix
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Mapping, Sequence
+    from typing import Protocol
+
+    class _Mapper(Protocol):
+        def map(
+            self, fn: Callable[[int], WorkerSnapshot], iterable: Iterable[int], /
+        ) -> Iterable[WorkerSnapshot]: ...
+
+
+@dataclass(frozen=True)
+class WorkerSnapshot:
+    """Compact description of a process’ environment."""
+
+    pid: int
+    """Process ID."""
+    python: str
+    """Python version."""
+    dists: tuple[tuple[str, str], ...]
+    """Sorted pairs of loaded distributions and their versions."""
+
+    @cached_property
+    def fingerprint(self) -> str:
+        """Short hash identifying identical environments."""
+        data = repr((self.python, self.dists)).encode()
+        return hashlib.blake2b(data, digest_size=6).hexdigest()
+
+
+@dataclass(frozen=True)
+class WorkerSessions:
+    """Environments of a parent process and its workers.
+
+    Can be displayed as string (:meth:`__repr__`) or Markdown.
+    """
+
+    parent: WorkerSnapshot
+    """Snapshot of the calling process."""
+    workers: Sequence[WorkerSnapshot]
+    """Snapshots of each worker process that ran a task."""
+
+    @cached_property
+    def environments(self) -> Mapping[str, Sequence[WorkerSnapshot]]:
+        """Snapshots (parent first) grouped by fingerprint."""
+        envs: defaultdict[str, list[WorkerSnapshot]] = defaultdict(list)
+        for snap in (self.parent, *self.workers):
+            envs[snap.fingerprint].append(snap)
+        return dict(envs)
+
+    @cached_property
+    def matrix(self) -> VersionMatrix:
+        """Merged version table with one column per distinct environment."""
+        columns: dict[str, dict[str, str]] = {}
+        for fp, snaps in self.environments.items():
+            n = sum(s is not self.parent for s in snaps)
+            who = [
+                *(["parent"] if snaps[0] is self.parent else []),
+                *([f"{n} worker{'s' if n > 1 else ''}"] if n else []),
+            ]
+            columns[f"{fp} ({', '.join(who)})"] = dict(snaps[0].dists)
+        return VersionMatrix(columns)
+
+    def __repr__(self) -> str:
+        """Generate string representation."""
+        return repr(self.matrix)
+
+    def _repr_markdown_(self) -> str:
+        return self.matrix._repr_markdown_()
+
+
+def collect_worker_sessions(
+    executor: _Mapper, *, tasks: int | None = None, spread: float = 0.05
+) -> WorkerSessions:
+    r"""Collect and compare environments of a process pool’s workers.
+
+    Works with :class:`concurrent.futures.Executor`\ s
+    and :class:`multiprocessing.pool.Pool`\ s.
+    Each worker scans its environment at most once per call,
+    and only a compact snapshot is sent back.
+
+    :param executor: Process pool whose workers to inspect.
+    :param tasks: Number of tasks to submit.
+        Defaults to the pool’s number of workers.
+    :param spread: Seconds each task waits before returning,
+        so idle workers pick up the remaining tasks.
+        Coverage of all workers is best-effort.
+
+    :return: Snapshots of parent and worker environments.
+    """
+    if tasks is None:
+        tasks = (
+            getattr(executor, "_max_workers", None)
+            or getattr(executor, "_processes", None)
+            or os.cpu_count()
+            or 1
+        )
+    token = time.monotonic_ns()
+    snaps = executor.map(partial(_snapshot, spread=spread), [token] * tasks)
+    workers = {s.pid: s for s in snaps if s.pid != os.getpid()}
+    return WorkerSessions(_snapshot_cached(token), list(workers.values()))
+
+
+def _snapshot(token: int, *, spread: float = 0.0) -> WorkerSnapshot:
+    snap = _snapshot_cached(token)
+    time.sleep(spread)
+    return snap
+
+
+@lru_cache(maxsize=1)
+def _snapshot_cached(token: int) -> WorkerSnapshot:
+    """Snapshot this process’ environment, once per `token`."""
+    del token  # only used as cache key
+    from . import SessionInfo, _AdditionalInfo
+    from ._dists import scan
+    from ._filter import DistFilter
+
+    info = _AdditionalInfo(os=None, cpu=None, gpu=())
+    keep = DistFilter.resolve()
+    pkg2dists, dist_index = scan(keep)
+    si = SessionInfo(
+        pkg2dists,
+        {},
+        dependencies=True,
+        info=info,
+        dist_filter=keep,
+        dist_index=dist_index,
+    )
+    dists = sorted(si.deps_dists, key=str.casefold)
+    return WorkerSnapshot(
+        os.getpid(),
+        sys.version.replace("\n", ""),
+        tuple((d, si._version(d)) for d in dists),  # noqa: SLF001
+    )
@@ -14,6 +14,8 @@ import pytest
 if TYPE_CHECKING:
     from collections.abc import Callable, Generator
 
+pytest_plugins = ["pytester"]
+
 DATA_DIR = Path(__file__).parent / "data"
 
 
@@ -0,0 +1,17 @@
+# SPDX-License-Identifier: MPL-2.0
+"""Test package with a lazy-loading module ``__getattr__`` (SPEC 1 style)."""
+
+from __future__ import annotations
+
+import importlib
+
+imports: list[str] = []
+"""Names of attributes that triggered a lazy import."""
+
+
+def __getattr__(name: str) -> object:
+    if name != "__version__":
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    imports.append(name)
+    return importlib.import_module(".heavy", __name__).VERSION
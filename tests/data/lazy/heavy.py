@@ -0,0 +1,6 @@
+# SPDX-License-Identifier: MPL-2.0
+"""Submodule that should never be imported just to print versions."""
+
+from __future__ import annotations
+
+VERSION = "0.5.post0"
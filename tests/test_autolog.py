@@ -0,0 +1,112 @@
+# SPDX-License-Identifier: MPL-2.0
+"""Test logging session info in the background."""
+
+from __future__ import annotations
+
+import logging
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from session_info2 import _autolog, start_autolog
+
+PTH_FILE = Path(_autolog.__file__).parent.parent / "session_info2_autolog.pth"
+
+
+@pytest.fixture(autouse=True)
+def _reset(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(_autolog, "_thread", None)
+    monkeypatch.delenv(_autolog.ENV_VAR, raising=False)
+
+
+def test_start_autolog(caplog: pytest.LogCaptureFixture) -> None:
+    with caplog.at_level(logging.INFO, logger="session_info2"):
+        thread = start_autolog(delay=0)
+        assert thread.daemon
+        assert start_autolog(delay=0) is thread
+        thread.join(timeout=30)
+    [record] = caplog.records
+    assert record.levelno == logging.INFO
+    si = record.session_info  # type: ignore[attr-defined]
+    assert si["info"]["Python"] == sys.version.replace("\n", "")
+    assert "pytest" in {d["package"] for d in [*si["packages"], *si["dependencies"]]}
+
+
+@pytest.mark.parametrize("value", ["", "0", "false", "No", " off "])
+def test_install_from_env_disabled(monkeypatch: pytest.MonkeyPatch, value: str) -> None:
+    monkeypatch.setenv(_autolog.ENV_VAR, value)
+    assert _autolog.install_from_env() is None
+
+
+@pytest.mark.parametrize(
+    ("value", "delay"),
+    [
+        pytest.param("yes", _autolog.DEFAULT_DELAY, id="truthy"),
+        pytest.param("ON", _autolog.DEFAULT_DELAY, id="truthy-upper"),
+        pytest.param("2.5", 2.5, id="delay"),
+        pytest.param("-3", 0.0, id="negative"),
+    ],
+)
+def test_install_from_env(
+    monkeypatch: pytest.MonkeyPatch, value: str, delay: float
+) -> None:
+    calls: list[float] = []
+    monkeypatch.setattr(
+        _autolog,
+        "start_autolog",
+        lambda *, delay=_autolog.DEFAULT_DELAY: calls.append(delay),
+    )
+    monkeypatch.setenv(_autolog.ENV_VAR, value)
+    _autolog.install_from_env()
+    assert calls == [delay]
+
+
+@pytest.mark.parametrize("value", ["maybe", "nan", "inf"])
+def test_install_from_env_invalid(
+    monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture, value: str
+) -> None:
+    monkeypatch.setenv(_autolog.ENV_VAR, value)
+    with caplog.at_level(logging.WARNING, logger="session_info2"):
+        assert _autolog.install_from_env() is None
+    [record] = caplog.records
+    assert f"Invalid {_autolog.ENV_VAR}={value!r}" in record.getMessage()
+    assert _autolog._thread is None  # noqa: SLF001
+
+
+def test_negative_delay(caplog: pytest.LogCaptureFixture) -> None:
+    with caplog.at_level(logging.INFO, logger="session_info2"):
+        start_autolog(delay=-1).join(timeout=30)
+    assert [r.levelno for r in caplog.records] == [logging.INFO]
+
+
+def test_pth_never_blocks_shutdown() -> None:
+    code = f"exec({PTH_FILE.read_text()!r}); print(type(_autolog._thread).__name__)"
+    env = dict(os.environ, **{_autolog.ENV_VAR: "60"})
+    start = time.perf_counter()
+    p = subprocess.run(
+        [sys.executable, "-c", f"import session_info2._autolog as _autolog; {code}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    assert p.stdout == "Thread\n"
+    assert time.perf_counter() - start < 30  # noqa: PLR2004
+
+
+def test_pth_invalid_value() -> None:
+    code = f"exec({PTH_FILE.read_text()!r}); print(_autolog._thread)"
+    env = dict(os.environ, **{_autolog.ENV_VAR: "maybe"})
+    p = subprocess.run(
+        [sys.executable, "-c", f"import session_info2._autolog as _autolog; {code}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    assert p.stdout == "None\n"
+    assert "Traceback" not in p.stderr
@@ -0,0 +1,123 @@
+# SPDX-License-Identifier: MPL-2.0
+"""Test the command line interface."""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from session_info2.__main__ import main
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    from pytest_subprocess import FakeProcess
+
+
+def test_json(
+    capsys: pytest.CaptureFixture[str],
+    import_path: Callable[[str], Any],
+    fp: FakeProcess,
+) -> None:
+    import_path("basic")  # imported again by CLI, but makes sure it’s cleaned up
+    import_path("namespace.package")
+    fp.allow_unregistered(allow=True)
+    main(["--format=json", "--no-deps", "basic", "namespace.package"])
+    out = json.loads(capsys.readouterr().out)
+    assert out["packages"] == [
+        dict(package="basic", version="1.0"),
+        dict(package="namespace.package", version="2.2.1"),
+    ]
+    assert "dependencies" not in out
+    assert "GPU" not in out["info"]
+    assert len(fp.calls) == 0  # GPU isn’t probed by default
+
+
+def test_exclude(
+    capsys: pytest.CaptureFixture[str], import_path: Callable[[str], Any]
+) -> None:
+    import_path("basic")
+    import_path("namespace.package")
+    main(["--format=json", "--exclude=namespace.*", "basic", "namespace.package"])
+    out = json.loads(capsys.readouterr().out)
+    assert out["packages"] == [dict(package="basic", version="1.0")]
+
+
+def test_gpu_timeout(capsys: pytest.CaptureFixture[str], fp: FakeProcess) -> None:
+    def callback(_: object) -> None:
+        raise subprocess.TimeoutExpired(cmd="nvidia-smi", timeout=0.5)
+
+    fp.register(["nvidia-smi", fp.any()], callback=callback)
+    main(["--gpu", "--timeout=0.5"])
+    assert "GPU\tGPU probe timed out after 0.5s" in capsys.readouterr().out
+
+
+def test_output(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    main(["--format=markdown", f"--output={tmp_path / 'out.md'}"])
+    assert not capsys.readouterr().out
+    assert (tmp_path / "out.md").read_text().startswith("| ")
+
+
+def test_startup_imports(libdir_test: Path) -> None:
+    """Plain text output doesn’t import rendering or optional modules."""
+    env = dict(os.environ, PYTHONPATH=str(libdir_test))
+    code = (
+        "import sys; from session_info2.__main__ import main; "
+        "main(['--no-deps', 'basic']); print(*sys.modules)"
+    )
+    p = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    assert p.stdout.startswith("basic\t1.0\n")
+    modules = set(p.stdout.splitlines()[-1].split())
+    heavy = {"IPython", "ipywidgets", "session_info2._repr", "session_info2._widget"}
+    assert not modules & heavy
+
+
+def test_no_cpu(capsys: pytest.CaptureFixture[str]) -> None:
+    main(["--format=json", "--no-cpu"])
+    assert "CPU" not in json.loads(capsys.readouterr().out)["info"]
+
+
+def test_timings(
+    capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("SESSION_INFO2_TIMINGS", "1")
+    main(["--format=json"])
+    assert "scan" in json.loads(capsys.readouterr().out)["timings"]
+
+
+def test_timeout_without_gpu(capsys: pytest.CaptureFixture[str]) -> None:
+    with pytest.raises(SystemExit):
+        main(["--timeout=0.5"])
+    assert "--timeout only applies to the GPU probe" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize(
+    ("args", "loaded"),
+    [
+        pytest.param([], set(), id="default"),
+        pytest.param(["--storage"], {"_sampler", "_storage"}, id="storage"),
+    ],
+)
+def test_lazy_imports(args: list[str], loaded: set[str]) -> None:
+    code = (
+        "import sys; from session_info2.__main__ import main; "
+        f"main({args!r}); print(*sys.modules)"
+    )
+    p = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    modules = set(p.stdout.splitlines()[-1].split())
+    optional = {"_sampler", "_storage"}
+    assert {m for m in optional if f"session_info2.{m}" in modules} == loaded
@@ -0,0 +1,159 @@
+# SPDX-License-Identifier: MPL-2.0
+"""Test crash-time snapshots."""
+
+from __future__ import annotations
+
+import logging
+import os
+import subprocess
+import sys
+import time
+from typing import TYPE_CHECKING, Any, NoReturn
+
+import pytest
+
+from session_info2 import CrashSnapshot
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+
+SCRIPT = """\
+import sys, threading, faulthandler
+from pathlib import Path
+from session_info2 import install_crash_hooks
+
+side_file = Path(sys.argv[2])
+snapshot = install_crash_hooks(faulthandler_file=side_file, refresh_interval=None)
+import basic
+snapshot.refresh()
+match sys.argv[1]:
+    case "thread":
+        t = threading.Thread(target=lambda: 1 / 0)
+        t.start()
+        t.join()
+    case "main":
+        1 / 0
+    case "segfault":
+        faulthandler._sigsegv()
+"""
+
+
+def test_refresh(libdir_test: Path, import_path: Callable[[str], Any]) -> None:
+    del libdir_test  # used for side effects
+    snapshot = CrashSnapshot(cpu=False)
+    assert snapshot.data.startswith(b"\n--- session info ---\n")
+    assert b"basic\t1.0" not in snapshot.data
+    assert not snapshot.refresh()  # nothing imported since
+
+    import_path("basic")
+    assert snapshot.refresh()
+    assert b"\nbasic\t1.0\n" in snapshot.data
+    assert not snapshot.refresh()
+
+
+def test_refresh_indexed(
+    import_path: Callable[[str], Any], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    snapshot = CrashSnapshot(cpu=False)
+    import_path("basic")
+
+    def no_search(name: str) -> NoReturn:
+        pytest.fail(f"searched for {name} instead of using the index")
+
+    monkeypatch.setattr("importlib.metadata.distribution", no_search)
+    assert snapshot.refresh()
+    assert b"\nbasic\t1.0\n" in snapshot.data
+
+
+def test_write() -> None:
+    snapshot = CrashSnapshot(cpu=False)
+    r, w = os.pipe()
+    with os.fdopen(r, "rb") as r_file:
+        snapshot.write(w)
+        os.close(w)
+        assert r_file.read() == snapshot.data
+
+
+def run_script(tmp_path: Path, libdir_test: Path, mode: str) -> tuple[str, str]:
+    side_file = tmp_path / "crash.txt"
+    env = dict(os.environ, PYTHONPATH=str(libdir_test))
+    p = subprocess.run(
+        [sys.executable, "-c", SCRIPT, mode, str(side_file)],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=False,
+    )
+    return p.stderr, side_file.read_text()
+
+
+def test_excepthook(tmp_path: Path, libdir_test: Path) -> None:
+    stderr, side = run_script(tmp_path, libdir_test, "main")
+    assert stderr.startswith("\n--- session info ---\n")
+    assert stderr.endswith("ZeroDivisionError: division by zero\n")
+    assert "\nbasic\t1.0\n" in stderr
+    assert "\nPython\t" in stderr
+    assert side.startswith("\n--- session info ---\n")
+
+
+def test_threading_excepthook(tmp_path: Path, libdir_test: Path) -> None:
+    stderr, _ = run_script(tmp_path, libdir_test, "thread")
+    assert stderr.startswith("\n--- session info ---\n")
+    assert "ZeroDivisionError" in stderr
+
+
+def test_faulthandler(tmp_path: Path, libdir_test: Path) -> None:
+    _, side = run_script(tmp_path, libdir_test, "segfault")
+    assert side.startswith("\n--- session info ---\nbasic\t1.0\n")
+    assert "Fatal Python error: Segmentation fault" in side
+
+
+@pytest.mark.parametrize("enabled", [True, False], ids=["enabled", "disabled"])
+def test_uninstall_faulthandler(tmp_path: Path, *, enabled: bool) -> None:
+    code = f"""\
+import faulthandler
+from pathlib import Path
+from session_info2 import CrashSnapshot
+
+if {enabled}:
+    faulthandler.enable()
+snapshot = CrashSnapshot(cpu=False)
+snapshot.install(faulthandler_file=Path({str(tmp_path / "crash.txt")!r}))
+assert faulthandler.is_enabled()
+snapshot.uninstall()
+print(faulthandler.is_enabled())
+"""
+    p = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert p.stdout == f"{enabled}\n"
+
+
+def test_refresh_loop_error(
+    monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    snapshot = CrashSnapshot(cpu=False)
+    calls = 0
+
+    def refresh() -> bool:
+        nonlocal calls
+        calls += 1
+        raise RuntimeError
+
+    monkeypatch.setattr(snapshot, "refresh", refresh)
+    r, w = os.pipe()
+    with caplog.at_level(logging.WARNING, logger="session_info2"):
+        snapshot.install(fd=w, refresh_interval=0.01)
+        try:
+            deadline = time.monotonic() + 10
+            while calls < 2 and time.monotonic() < deadline:  # noqa: PLR2004
+                time.sleep(0.01)
+        finally:
+            snapshot.uninstall()
+    os.close(w)
+    with os.fdopen(r, "rb") as r_file:
+        assert r_file.read() == b""  # the crash hook wasn’t triggered
+    assert calls >= 2  # noqa: PLR2004
+    assert "Failed to refresh crash snapshot" in caplog.text
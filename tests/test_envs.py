@@ -0,0 +1,52 @@
+# SPDX-License-Identifier: MPL-2.0
+"""Test scanning multiple environments."""
+
+from __future__ import annotations
+
+import shutil
+from typing import TYPE_CHECKING
+
+import pytest
+
+from session_info2 import scan_environments
+from session_info2._dists import site_packages
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture
+def envs(tmp_path: Path, libdir_test: Path) -> list[Path]:
+    venv = tmp_path / "venv"
+    (sp := venv / "lib" / "python3.99" / "site-packages").mkdir(parents=True)
+    shutil.copytree(libdir_test / "basic-1.0.dist-info", sp / "basic-1.1.dist-info")
+    (sp / "basic-1.1.dist-info" / "METADATA").write_text(
+        "Metadata-Version: 2.1\nName: basic\nVersion: 1.1\n"
+    )
+    conda = tmp_path / "conda"
+    (sp := conda / "Lib" / "site-packages").mkdir(parents=True)
+    shutil.copytree(libdir_test / "dep-0.3.dist-info", sp / "dep-0.3.dist-info")
+    return [libdir_test, venv, conda]
+
+
+def test_site_packages(envs: list[Path]) -> None:
+    data, venv, conda = envs
+    assert site_packages(data) == [data]
+    assert site_packages(venv) == [venv / "lib" / "python3.99" / "site-packages"]
+    assert site_packages(conda) == [conda / "Lib" / "site-packages"]
+
+
+@pytest.mark.parametrize("max_workers", [1, None])
+def test_scan_environments(envs: list[Path], max_workers: int | None) -> None:
+    data, venv, conda = envs
+    m = scan_environments(envs, max_workers=max_workers)
+    assert list(m.columns) == [str(data), str(venv), str(conda)]
+    assert m.columns[str(data)]["basic"] == "1.0"
+    assert m.differing["basic"] == ("1.0", "1.1", None)
+    assert m.differing["dep"] == ("0.3", None, "0.3")
+    assert repr(m).splitlines()[1:3] == ["basic *\t1.0\t1.1\t-", "dep *\t0.3\t-\t0.3"]
+
+
+def test_scan_environments_missing(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match=r"No site-packages directory found"):
+        scan_environments([tmp_path])
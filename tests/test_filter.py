@@ -0,0 +1,136 @@
+# SPDX-License-Identifier: MPL-2.0
+"""Test filtering reported distributions."""
+
+from __future__ import annotations
+
+import re
+import sys
+from contextlib import nullcontext
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from session_info2 import DistFilter, SessionInfo, _AdditionalInfo
+from session_info2._dists import packages_distributions
+from session_info2._filter import ENV_EXCLUDE, ENV_INCLUDE
+
+HAS_TOML = sys.version_info >= (3, 11) or find_spec("tomli") is not None
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    from session_info2._filter import Pattern
+
+
+@pytest.mark.parametrize(
+    ("dist_filter", "dist", "expected"),
+    [
+        pytest.param(DistFilter(), "numpy", True, id="default"),
+        pytest.param(DistFilter(), "IPython", False, id="default-excluded"),
+        pytest.param(
+            DistFilter(exclude=["jupyter_*"]), "Jupyter.Core", False, id="glob"
+        ),
+        pytest.param(DistFilter(exclude=["jupyter_*"]), "jupyter", True, id="glob-no"),
+        pytest.param(
+            DistFilter(exclude=[r"re:py.*-stubs"]), "pyarrow-stubs", False, id="re"
+        ),
+        pytest.param(
+            DistFilter(exclude=[re.compile(r"x\d")]), "x1", False, id="compiled"
+        ),
+        pytest.param(DistFilter(include=["num*"]), "numpy", True, id="include"),
+        pytest.param(DistFilter(include=["num*"]), "scipy", False, id="include-no"),
+        pytest.param(DistFilter(include=[]), "numpy", False, id="include-none"),
+        pytest.param(
+            DistFilter(include=["num*"], exclude=["numba"]), "numba", False, id="both"
+        ),
+    ],
+)
+def test_filter(dist_filter: DistFilter, dist: str, *, expected: bool) -> None:
+    assert dist_filter(dist) is expected
+
+
+@pytest.fixture
+def config_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.delenv(ENV_INCLUDE, raising=False)
+    monkeypatch.delenv(ENV_EXCLUDE, raising=False)
+    (tmp_path / "pyproject.toml").write_text(
+        '[tool.session-info2]\ninclude = ["a*", "b*"]\n'
+    )
+    (subdir := tmp_path / "sub" / "dir").mkdir(parents=True)
+    return subdir
+
+
+@pytest.mark.parametrize(
+    ("include", "env", "expected"),
+    [
+        pytest.param(["c"], "d", ("c",), id="arg"),
+        pytest.param(None, "d, e", ("d", "e"), id="env"),
+        pytest.param(
+            None,
+            None,
+            ("a*", "b*"),
+            id="config",
+            marks=pytest.mark.skipif(not HAS_TOML, reason="needs tomllib or tomli"),
+        ),
+    ],
+)
+def test_resolve(
+    monkeypatch: pytest.MonkeyPatch,
+    config_dir: Path,
+    *,
+    include: list[Pattern] | None,
+    env: str | None,
+    expected: tuple[str, ...],
+) -> None:
+    if env is not None:
+        monkeypatch.setenv(ENV_INCLUDE, env)
+    dist_filter = DistFilter.resolve(include, config_dir=config_dir)
+    assert dist_filter == DistFilter(include=expected)
+
+
+@pytest.mark.skipif(HAS_TOML, reason="tests missing TOML parser")
+def test_resolve_config_unreadable(config_dir: Path) -> None:
+    with pytest.warns(RuntimeWarning, match=r"install `tomli`"):
+        assert DistFilter.resolve(config_dir=config_dir) == DistFilter()
+
+
+def test_resolve_config_invalid(config_dir: Path) -> None:
+    (config_dir / "pyproject.toml").write_text("[tool.session-info2\n")
+    expected_warning = (
+        pytest.warns(RuntimeWarning, match=r"Could not read")
+        if HAS_TOML
+        else nullcontext()
+    )
+    with expected_warning:
+        assert DistFilter.resolve(config_dir=config_dir) == DistFilter()
+
+
+def test_resolve_default(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv(ENV_INCLUDE, raising=False)
+    monkeypatch.delenv(ENV_EXCLUDE, raising=False)
+    assert DistFilter.resolve(config_dir=tmp_path) == DistFilter()
+    assert DistFilter.resolve(exclude=[], config_dir=tmp_path) == DistFilter(exclude=())
+
+
+def test_scan(libdir_test: Path) -> None:
+    pkg2dists = packages_distributions(
+        [libdir_test], keep=DistFilter(exclude=["mis*", "namespace.*"])
+    )
+    assert set(pkg2dists) == {"basic", "dep", "lazy"}
+
+
+def test_deps(import_path: Callable[[str], Any]) -> None:
+    user_globals = dict(basic=import_path("basic"))
+    import_path("dep")
+    import_path("mis_match")
+    pkg2dists = dict(basic=["basic"], dep=["dep"], mis_match=["mismatch"])
+    si = SessionInfo(
+        pkg2dists,
+        user_globals,
+        info=_AdditionalInfo(os=None, cpu=None, gpu=()),
+        dist_filter=DistFilter(exclude=["dep"]),
+    )
+    assert list(si.imported_dists) == ["basic"]
+    assert set(si.deps_dists) == {"mismatch"}
@@ -0,0 +1,92 @@
+# SPDX-License-Identifier: MPL-2.0
+"""Test that importing the package is cheap."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+import session_info2
+
+# Generous, since CI machines can be slow. Locally this takes a few milliseconds.
+IMPORT_BUDGET = 0.5
+
+CODE = """\
+import sys, time
+before = set(sys.modules)
+start = time.perf_counter()
+import session_info2
+print(time.perf_counter() - start)
+print(*sorted(set(sys.modules) - before))
+"""
+
+DEFERRED = {
+    "concurrent.futures",
+    "datetime",
+    "importlib.metadata",
+    "json",
+    "multiprocessing",
+    "platform",
+    "subprocess",
+    "textwrap",
+    "session_info2._build",
+    "session_info2._dists",
+    "session_info2._envs",
+    "session_info2._filter",
+    "session_info2._matrix",
+    "session_info2._pu",
+    "session_info2._repr",
+    "session_info2._resolve",
+    "session_info2._sampler",
+    "session_info2._storage",
+    "session_info2._vcs",
+    "session_info2._widget",
+    "session_info2._workers",
+}
+
+
+def test_import_cost() -> None:
+    cmd = [sys.executable, "-c", CODE]
+    p = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    elapsed, modules = p.stdout.splitlines()
+    assert float(elapsed) < IMPORT_BUDGET
+    assert "session_info2" in modules.split()
+    assert not DEFERRED & set(modules.split())
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "BuildVariant",
+        "collect_worker_sessions",
+        "CrashSnapshot",
+        "DistFilter",
+        "DistResolver",
+        "install_crash_hooks",
+        "ResourceSampler",
+        "scan_environments",
+        "start_autolog",
+        "start_sampler",
+        "StorageInfo",
+        "Timings",
+        "VersionMatrix",
+        "WorkerSessions",
+        "WorkerSnapshot",
+    ],
+)
+def test_lazy_attr(name: str) -> None:
+    assert name in dir(session_info2)
+    assert getattr(session_info2, name).__name__ == name
+
+
+def test_lazy_attr_missing() -> None:
+    with pytest.raises(AttributeError, match=r"has no attribute 'foo'"):
+        session_info2.foo  # noqa: B018
+
+
+def test_ignored_deprecated() -> None:
+    with pytest.warns(DeprecationWarning, match=r"IGNORED"):
+        from session_info2 import IGNORED
+    assert {"ipython", "session-info2"} == IGNORED
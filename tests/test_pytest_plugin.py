@@ -0,0 +1,96 @@
+# SPDX-License-Identifier: MPL-2.0
+"""Test the pytest plugin.
+
+Uses subprocesses so the outer configuration doesn’t leak into test runs.
+"""
+
+from __future__ import annotations
+
+import json
+import xml.etree.ElementTree as ET
+from typing import TYPE_CHECKING
+
+import pytest
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+CONFTEST_DIFFERENT_WORKERS = """\
+import session_info2._pytest_plugin as plugin
+
+def pytest_configure(config):
+    if hasattr(config, "workerinput"):
+        plugin._fingerprint = lambda: "different"
+"""
+
+
+@pytest.fixture(autouse=True)
+def _test_file(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile("def test_x(): pass")
+
+
+def test_disabled(pytester: pytest.Pytester) -> None:
+    result = pytester.runpytest_subprocess()
+    result.assert_outcomes(passed=1)
+    result.stdout.no_fnmatch_line("session-info2:*")
+
+
+@pytest.fixture
+def installed_not_loaded(
+    pytester: pytest.Pytester, monkeypatch: pytest.MonkeyPatch, libdir_test: Path
+) -> None:
+    """Make the test data distributions installed, and import one only in a test."""
+    monkeypatch.setenv("PYTHONPATH", str(libdir_test))
+    pytester.makepyfile(test_import="def test_import(): import basic")
+
+
+@pytest.mark.usefixtures("installed_not_loaded")
+def test_header_junit(pytester: pytest.Pytester) -> None:
+    xml_path = pytester.path / "junit.xml"
+    result = pytester.runpytest_subprocess("--session-info", f"--junitxml={xml_path}")
+    result.assert_outcomes(passed=2)
+    result.stdout.fnmatch_lines(["session-info2: * installed distributions, Python: *"])
+    prop = ET.parse(xml_path).find(".//property[@name='session_info']")  # noqa: S314
+    assert prop is not None
+    dists = {
+        d["package"]: d["version"]
+        for d in json.loads(prop.attrib["value"])["distributions"]
+    }
+    assert "pytest" in dists
+    assert dists["basic"] == "1.0"
+
+
+def test_ini(pytester: pytest.Pytester) -> None:
+    pytester.makeini("[pytest]\nsession_info = true\n")
+    result = pytester.runpytest_subprocess()
+    result.stdout.fnmatch_lines(["session-info2: *"])
+
+
+@pytest.mark.parametrize("different", [False, True], ids=["same", "different"])
+def test_xdist(pytester: pytest.Pytester, *, different: bool) -> None:
+    pytest.importorskip("xdist")
+    if different:
+        pytester.makeconftest(CONFTEST_DIFFERENT_WORKERS)
+    result = pytester.runpytest_subprocess("--session-info", "-n", "2")
+    result.assert_outcomes(passed=1)
+    if different:
+        result.stdout.fnmatch_lines(
+            ["*session-info2 warnings*", "gw?: Python environment differs*"]
+        )
+    else:
+        result.stdout.no_fnmatch_line("*session-info2 warnings*")
+
+
+@pytest.mark.usefixtures("installed_not_loaded")
+@pytest.mark.parametrize("args", [[], ["-q"]], ids=["header", "no-header"])
+def test_benchmark(pytester: pytest.Pytester, args: list[str]) -> None:
+    pytest.importorskip("pytest_benchmark")
+    pytester.makepyfile(test_bench="def test_b(benchmark): benchmark(sum, [1])")
+    json_path = pytester.path / "bench.json"
+    result = pytester.runpytest_subprocess(
+        "--session-info", f"--benchmark-json={json_path}", *args
+    )
+    result.assert_outcomes(passed=3)
+    snapshot = json.loads(json_path.read_text())["machine_info"]["session_info"]
+    assert "Python" in snapshot["info"]
+    assert {"package": "basic", "version": "1.0"} in snapshot["distributions"]
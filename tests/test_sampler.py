@@ -0,0 +1,105 @@
+# SPDX-License-Identifier: MPL-2.0
+"""Test sampling resource usage."""
+
+from __future__ import annotations
+
+import os
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+
+from session_info2 import ResourceSampler, _AdditionalInfo, _sampler, start_sampler
+from session_info2._sampler import ResourceSample, _stats
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest_subprocess import FakeProcess
+
+TICKS = os.sysconf("SC_CLK_TCK")
+
+
+@pytest.fixture(autouse=True)
+def _reset(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(_sampler, "_active", None)
+
+
+def write_proc(proc: Path, *, rss_kib: int, hwm_kib: int, ticks: int) -> None:
+    (proc / "self").mkdir(parents=True, exist_ok=True)
+    (proc / "self" / "status").write_text(
+        f"Name:\tpython\nVmHWM:\t  {hwm_kib} kB\nVmRSS:\t  {rss_kib} kB\n"
+    )
+    # command name with space and parenthesis, utime/stime are fields 14/15
+    fields = ["S", *["0"] * 10, str(ticks), "0", *["0"] * 30]
+    (proc / "self" / "stat").write_text(f"42 (py (thon)) {' '.join(fields)}\n")
+
+
+def test_sample(tmp_path: Path) -> None:
+    write_proc(tmp_path, rss_kib=1024, hwm_kib=4096, ticks=3 * TICKS)
+    sampler = ResourceSampler(proc=tmp_path)
+    s = sampler.sample()
+    assert (s.rss, s.rss_peak, s.cpu_time, s.gpu_memory) == (2**20, 2**22, 3.0, None)
+    assert sampler.samples == (s,)
+
+
+def test_sample_missing(tmp_path: Path) -> None:
+    s = ResourceSampler(proc=tmp_path).sample()
+    assert (s.rss, s.rss_peak, s.cpu_time) == (None, None, None)
+    assert _stats([s]) == dict(samples=1, seconds=0.0)
+
+
+def test_ring_buffer(tmp_path: Path) -> None:
+    write_proc(tmp_path, rss_kib=1, hwm_kib=1, ticks=0)
+    sampler = ResourceSampler(size=3, proc=tmp_path)
+    samples = [sampler.sample() for _ in range(5)]
+    assert sampler.samples == tuple(samples[-3:])
+
+
+def test_stats() -> None:
+    mib = 2**20
+    samples = [
+        ResourceSample(0.0, 100 * mib, 150 * mib, 10.0, 1000 * mib),
+        ResourceSample(1.0, 300 * mib, 300 * mib, 12.0, 3000 * mib),
+        ResourceSample(3.0, 200 * mib, 300 * mib, 13.0, 2000 * mib),
+    ]
+    assert _stats(samples) == dict(
+        samples=3,
+        seconds=3.0,
+        rss=dict(peak=300 * mib, mean=200 * mib),
+        cpu=dict(peak=2.0, mean=1.0),
+        gpu_memory=dict(peak=3000 * mib, mean=2000 * mib),
+    )
+    sampler = ResourceSampler()
+    sampler._samples.extend(samples)  # noqa: SLF001
+    assert dict(sampler._table()) == {  # noqa: SLF001
+        "Memory": "peak 300.0 MiB, mean 200.0 MiB",
+        "CPU usage": "peak 200%, mean 100%",
+        "GPU memory": "peak 2.9 GiB, mean 2.0 GiB",
+        "Sampled": "3 times over 3s",
+    }
+
+
+def test_gpu(fp: FakeProcess) -> None:
+    fp.register(["nvidia-smi", fp.any()], stdout="1024\n512\n")
+    sampler = ResourceSampler(gpu=True)
+    assert sampler.sample().gpu_memory == 1536 * 2**20
+
+
+def test_start_sampler() -> None:
+    sampler = start_sampler(interval=0.01)
+    try:
+        assert sampler.running
+        assert start_sampler() is sampler
+        deadline = time.monotonic() + 10
+        while len(sampler.samples) < 2 and time.monotonic() < deadline:  # noqa: PLR2004
+            time.sleep(0.01)
+        info = dict(_AdditionalInfo(os=None, cpu=None, gpu=())._table())  # noqa: SLF001
+        assert info["Memory"].startswith("peak ")
+        assert "Sampled" in info
+    finally:
+        sampler.stop()
+    assert not sampler.running
+    assert _sampler.active_sampler() is None
+    info = dict(_AdditionalInfo(os=None, cpu=None, gpu=())._table())  # noqa: SLF001
+    assert "Memory" not in info
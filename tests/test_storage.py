@@ -0,0 +1,75 @@
+# SPDX-License-Identifier: MPL-2.0
+"""Test reading storage and memory configuration."""
+
+from __future__ import annotations
+
+from pathlib import Path, PurePosixPath
+
+import pytest
+
+from session_info2 import StorageInfo, _AdditionalInfo
+from session_info2._storage import Mount
+
+MOUNTINFO = r"""
+22 1 8:1 / / rw,relatime shared:1 - ext4 /dev/sda1 rw
+25 22 0:21 / /tmp rw,nosuid shared:5 - tmpfs tmpfs rw
+26 22 0:22 / /home/me/my\040data rw - nfs4 server:/export/data rw
+27 22 0:23 / /tmp rw - overlay overlay rw
+""".lstrip()
+
+MEMINFO = """\
+MemTotal:       16384000 kB
+MemFree:         1024000 kB
+MemAvailable:    8192000 kB
+SwapTotal:             0 kB
+SwapFree:              0 kB
+HugePages_Total:       0
+"""
+
+
+@pytest.fixture
+def root(tmp_path: Path) -> Path:
+    (tmp_path / "proc" / "self").mkdir(parents=True)
+    (tmp_path / "proc" / "self" / "mountinfo").write_text(MOUNTINFO)
+    (tmp_path / "proc" / "meminfo").write_text(MEMINFO)
+    (thp := tmp_path / "sys" / "kernel" / "mm" / "transparent_hugepage").mkdir(
+        parents=True
+    )
+    (thp / "enabled").write_text("always [madvise] never\n")
+    return tmp_path
+
+
+def test_read(root: Path) -> None:
+    paths = {"Data": "/home/me/my data/x", "Tmp": "/tmp/y", "Home": "/home/me"}  # noqa: S108
+    info = StorageInfo.read(root, paths=paths)
+    assert info.paths == {
+        "Data": Mount(PurePosixPath("/home/me/my data"), "nfs4", "server:/export/data"),
+        # the last of stacked mounts is visible
+        "Tmp": Mount(PurePosixPath("/tmp"), "overlay", "overlay"),  # noqa: S108
+        "Home": Mount(PurePosixPath("/"), "ext4", "/dev/sda1"),
+    }
+    assert info.memory["MemTotal"] == 16384000 * 1024
+    assert info.memory["HugePages_Total"] == 0
+    assert info.transparent_hugepages == "madvise"
+    assert dict(info._table()) == {  # noqa: SLF001
+        "Data": "nfs4 (server:/export/data on /home/me/my data)",
+        "Tmp": "overlay (overlay on /tmp)",
+        "Home": "ext4 (/dev/sda1 on /)",
+        "RAM": "15.6 GiB total, 7.8 GiB available",
+        "Swap": "none",
+        "Transparent hugepages": "madvise",
+    }
+
+
+def test_read_missing(tmp_path: Path) -> None:
+    info = StorageInfo.read(tmp_path, paths={"Cwd": "/"})
+    assert info == StorageInfo(paths={"Cwd": None})
+    assert list(info._table()) == []  # noqa: SLF001
+
+
+def test_additional_info(root: Path) -> None:
+    storage = StorageInfo.read(root)
+    info = _AdditionalInfo(os=None, cpu=None, gpu=(), storage=storage)
+    rows = dict(info._table())  # noqa: SLF001
+    assert {"Working directory", "Temporary directory", "site-packages"} <= set(rows)
+    assert rows["Transparent hugepages"] == "madvise"
@@ -0,0 +1,125 @@
+# SPDX-License-Identifier: MPL-2.0
+"""Test using session info from multiple threads."""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+import types
+from collections.abc import Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+from session_info2 import SessionInfo, _AdditionalInfo, _repr
+from session_info2._sync import once_property, snapshot
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+N_THREADS = 16
+
+
+class Counted:
+    """Object counting how often its property is computed."""
+
+    def __init__(self) -> None:  # noqa: D107
+        self._lock = threading.RLock()
+        self.calls = 0
+
+    @once_property
+    def value(self) -> int:
+        self.calls += 1
+        time.sleep(0.01)  # give other threads a chance to race
+        return self.calls
+
+    @once_property
+    def dependent(self) -> int:
+        return self.value + 1
+
+
+def test_once_property() -> None:
+    obj = Counted()
+    barrier = threading.Barrier(N_THREADS)
+
+    def get(_: object) -> int:
+        barrier.wait()
+        return obj.dependent
+
+    with ThreadPoolExecutor(N_THREADS) as pool:
+        results = set(pool.map(get, range(N_THREADS)))
+    assert results == {2}
+    assert obj.calls == 1
+
+
+class Flaky(Mapping[str, int]):
+    """Mapping that changes size during the first iteration."""
+
+    def __init__(self) -> None:  # noqa: D107
+        self.data = dict(a=1)
+        self.iterations = 0
+
+    def __getitem__(self, key: str) -> int:
+        return self.data[key]
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __iter__(self) -> Iterator[str]:
+        self.iterations += 1
+        if self.iterations == 1:
+            msg = "dictionary changed size during iteration"
+            raise RuntimeError(msg)
+        return iter(self.data)
+
+
+def test_snapshot_retry() -> None:
+    mapping = Flaky()
+    assert snapshot(mapping) == dict(a=1)
+    assert mapping.iterations > 1
+
+
+def test_concurrent_reprs(import_path: Callable[[str], Any]) -> None:
+    user_globals: dict[str, Any] = dict(basic=import_path("basic"))
+    import_path("dep")
+    pkg2dists = dict(basic=["basic"], dep=["dep"])
+    info = _AdditionalInfo(os=None, cpu=None, gpu=())
+    si = SessionInfo(pkg2dists, user_globals, info=info, dependency_graph=True)
+    barrier = threading.Barrier(N_THREADS + 1)
+    done = threading.Event()
+
+    def churn() -> None:
+        """Modify globals and sys.modules while reprs are being generated."""
+        barrier.wait()
+        i = 0
+        while not done.is_set():
+            name = f"_churn_{i % 100}"
+            user_globals[name] = i
+            sys.modules[name] = types.ModuleType(name)
+            if i % 2:
+                del user_globals[name], sys.modules[name]
+            i += 1
+        for name in [*user_globals]:
+            if name.startswith("_churn_"):
+                del user_globals[name], sys.modules[name]
+
+    def render(_: object) -> tuple[str, ...]:
+        barrier.wait()
+        return (
+            repr(si),
+            _repr.repr_markdown(si),
+            _repr.repr_html(si),
+            str(hash(si)),
+        )
+
+    churner = threading.Thread(target=churn)
+    churner.start()
+    try:
+        with ThreadPoolExecutor(N_THREADS) as pool:
+            results = set(pool.map(render, range(N_THREADS)))
+    finally:
+        done.set()
+        churner.join()
+    assert len(results) == 1
+    assert list(si.imported_dists) == ["basic"]
+    assert set(si.deps_dists) == {"dep"}
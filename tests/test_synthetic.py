@@ -3,15 +3,21 @@
 
 from __future__ import annotations
 
+import importlib.util
+import json
 import re
-from typing import TYPE_CHECKING, Any
+import sys
+import types
+from typing import TYPE_CHECKING, Any, NoReturn
 
 import pytest
 
-from session_info2 import SessionInfo, _repr
+from session_info2 import SessionInfo, _AdditionalInfo, _repr
 
 if TYPE_CHECKING:
     from collections.abc import Callable, Iterable, Mapping, Sequence
+    from importlib.metadata import Distribution
+    from pathlib import Path
 
     from pytest_subprocess import FakeProcess
 
@@ -130,6 +136,117 @@ def test_markdown(
     # info_rows content is already tested for plain text, no need to test it again
 
 
+def test_version_lazy_getattr(import_path: Callable[[str], Any]) -> None:
+    lazy = import_path("lazy")
+    si = SessionInfo(dict(lazy=["lazy"]), dict(lazy=lazy))
+    assert repr(si).startswith("lazy\t0.5\n")
+    assert lazy.imports == []
+    assert "lazy.heavy" not in sys.modules
+
+
+def test_version_lazy_loader(libdir_test: Path) -> None:
+    del libdir_test  # used for side effects
+    assert (spec := importlib.util.find_spec("mis_match"))
+    assert spec.loader
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    try:
+        si = SessionInfo(dict(mis_match=["mismatch"]), dict(mis_match=mod))
+        sys.modules["mis_match"] = mod
+        assert repr(si).startswith("mismatch\t1.1\n")
+        assert type(mod) is not types.ModuleType  # still not loaded
+    finally:
+        sys.modules.pop("mis_match", None)
+
+
+def test_dependency_graph(import_path: Callable[[str], Any]) -> None:
+    user_globals = dict(basic=import_path("basic"))
+    for mod in ["dep", "mis_match", "namespace.package"]:
+        import_path(mod)  # loaded, but not imported into globals
+    pkg2dists = dict(
+        basic=["basic"],
+        dep=["dep"],
+        mis_match=["mismatch"],
+        namespace=["namespace.package"],
+    )
+    si = SessionInfo(pkg2dists, user_globals, dependency_graph=True)
+    assert si.dep_graph.requires["basic"] == ("dep", "mismatch")
+    assert si.dep_graph.orphans == ("namespace.package",)
+
+    md = _repr.repr_markdown(si).split("\n\n")[-3:]
+    assert md == [
+        "**Dependency graph**",
+        "- basic 1.0\n  - dep 0.3\n  - mismatch 1.1 (1.1.post0.dev0)",
+        "Loaded without declared requirer: namespace.package",
+    ]
+    html = _repr.repr_html(si)
+    assert (
+        "<ul><li>basic 1.0<ul><li>dep 0.3</li><li>mismatch 1.1 (1.1.post0.dev0)"
+        "</li></ul></li></ul>"
+    ) in html
+    graph_json = json.loads(_repr.repr_json(si))["dependency_graph"]
+    assert graph_json["pulled_in_by"] == dict(dep=["basic"], mismatch=["basic"])
+
+
+def test_dependency_graph_index(tmp_path: Path) -> None:
+    from importlib.metadata import PathDistribution
+
+    dist_index: dict[str, Distribution] = {}
+    for name, reqs in [("app", ["Lib_X (>=1)"]), ("lib-x", [])]:
+        (meta_path := tmp_path / f"{name}-1.0.dist-info").mkdir()
+        (meta_path / "METADATA").write_text(
+            f"Metadata-Version: 2.1\nName: {name}\nVersion: 1.0\n"
+            + "".join(f"Requires-Dist: {r}\n" for r in reqs)
+        )
+        dist_index[name] = PathDistribution(meta_path)
+    # not on `sys.path`, so only findable via the index
+    user_globals = {
+        mod: type("Cls", (), dict(__module__=mod))() for mod in ["app", "lib_x"]
+    }
+    si = SessionInfo(
+        dict(app=["app"], lib_x=["lib-x"]),
+        user_globals,
+        info=_AdditionalInfo(os=None, cpu=None, gpu=()),
+        dependency_graph=True,
+        dist_index=dist_index,
+    )
+    assert si.requirements == dict(app={"lib-x"}, **{"lib-x": frozenset()})
+    assert si.dep_graph.requires == dict(app=("lib-x",), **{"lib-x": ()})
+
+
+def test_build_variants(
+    import_path: Callable[[str], Any],
+    libdir_test: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    from session_info2._dists import packages_distributions
+
+    dist_index: dict[str, Distribution] = {}
+    pkg2dists = packages_distributions([libdir_test], index=dist_index)
+    user_globals = dict(basic=import_path("basic"))
+    import_path("dep")
+    info = _AdditionalInfo(os=None, cpu=None, gpu=(), isa=("avx2",))
+    si = SessionInfo(
+        pkg2dists, user_globals, info=info, build_variants=True, dist_index=dist_index
+    )
+
+    def no_lookup(name: str) -> NoReturn:
+        pytest.fail(f"Looked up {name} instead of using index")
+
+    with monkeypatch.context() as m:
+        m.setattr("importlib.metadata.distribution", no_lookup)
+        assert set(si.builds) == {"basic", "dep"}
+    assert repr(si).split("\n----\t----\n")[1:3] == [
+        "basic\tpy3-none-any via pip\ndep\tnot a wheel",
+        f"Python\t{info.sys}\nCPU ISA\tavx2\nUpdated\t{info.date}",
+    ]
+    builds = json.loads(_repr.repr_json(si))["builds"]
+    assert builds["basic"] == dict(
+        tags=["py3-none-any"], installer="pip", url=None, commit=None, editable=False
+    )
+
+
 def test_gpu(fp: FakeProcess) -> None:
     fp.allow_unregistered(allow=True)
     fp.register(
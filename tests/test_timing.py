@@ -0,0 +1,51 @@
+# SPDX-License-Identifier: MPL-2.0
+"""Test phase timing instrumentation."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+
+from session_info2 import Timings, session_info
+
+if TYPE_CHECKING:
+    from pytest_subprocess import FakeProcess
+
+
+@pytest.fixture(autouse=True)
+def _no_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("SESSION_INFO2_TIMINGS", raising=False)
+
+
+def test_disabled() -> None:
+    si = session_info()
+    assert si.timings is None
+    mb = si._repr_mimebundle_(include={"application/json"})
+    assert "timings" not in json.loads(mb["application/json"])
+
+
+@pytest.mark.parametrize(("value", "enabled"), [("1", True), ("0", False)])
+def test_env_var(monkeypatch: pytest.MonkeyPatch, value: str, *, enabled: bool) -> None:
+    monkeypatch.setenv("SESSION_INFO2_TIMINGS", value)
+    assert (session_info().timings is not None) is enabled
+
+
+def test_phases(fp: FakeProcess) -> None:
+    fp.allow_unregistered(allow=True)
+    spans: list[tuple[str, float, float]] = []
+    t = Timings(hook=lambda *span: spans.append(span))
+    si = session_info(gpu=True, dependencies=True, timings=t)
+    assert si.timings is t
+    mb = si._repr_mimebundle_(include={"text/plain", "application/json"})
+
+    assert {"scan", "os", "cpu", "gpu", "attribution", "version"} <= t.phases.keys()
+    assert {"render:text/plain", "render:application/json"} <= t.phases.keys()
+    assert t.phases["scan"].calls == 1
+    assert len(spans) == sum(p.calls for p in t.phases.values())
+    assert all(end >= start for _, start, end in spans)
+
+    timings_json = json.loads(mb["application/json"])["timings"]
+    assert timings_json["scan"]["calls"] == 1
+    assert timings_json["scan"]["seconds"] == t.phases["scan"].seconds
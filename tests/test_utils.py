@@ -3,29 +3,57 @@
 
 from __future__ import annotations
 
+import zipfile
 from importlib.metadata import PathDistribution
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 import pytest
 
-from session_info2 import _mods
-from session_info2._dists import _top_level_editable
+from session_info2 import DistResolver
+from session_info2._build import BuildVariant
+from session_info2._dists import (
+    ZipDistribution,
+    _top_level_editable,
+    installed_versions,
+    packages_distributions,
+)
+from session_info2._graph import DependencyGraph, normalize, parse_requirements
+from session_info2._pu import isa_flags
 
 if TYPE_CHECKING:
-    from pathlib import Path
+    from importlib.metadata import Distribution
+
+
+PKG2DISTS = dict(
+    foo=["foo-dist"],
+    ns=[],
+    **{"ns.bar": ["ns-bar"], "ns.bar.baz": ["ns-bar-baz", "other"]},
+)
 
 
 @pytest.mark.parametrize(
     ("mod_name", "expected"),
     [
-        pytest.param("foo", ["foo"], id="one"),
-        pytest.param("foo.bar", ["foo.bar", "foo"], id="two"),
-        pytest.param("foo.bar.baz", ["foo.bar.baz", "foo.bar", "foo"], id="three"),
+        pytest.param("foo", "foo-dist", id="one"),
+        pytest.param("foo.bar.baz", "foo-dist", id="nested"),
+        pytest.param("ns.bar", "ns-bar", id="two"),
+        pytest.param("ns.bar.qux", "ns-bar", id="prefix"),
+        pytest.param("ns.bar.baz.qux", "ns-bar-baz", id="longest"),
+        pytest.param("ns.other", None, id="empty"),
+        pytest.param("unknown.foo", None, id="unknown"),
     ],
 )
-def test_mods(mod_name: str, expected: list[str]) -> None:
-    assert list(_mods(mod_name)) == expected
+def test_resolver(mod_name: str, expected: str | None) -> None:
+    assert DistResolver(PKG2DISTS)(mod_name) == expected
+
+
+def test_resolver_memo() -> None:
+    resolver = DistResolver(PKG2DISTS, maxsize=2)
+    for mod_name in ["foo.a", "foo.a", "foo.a", "ns.bar", "foo.b"]:
+        resolver(mod_name)
+    info = resolver._resolve.cache_info()  # noqa: SLF001
+    assert (info.hits, info.misses, info.currsize) == (2, 3, 2)
 
 
 def test_top_level_editable(tmp_path: Path, libdir_test: Path) -> None:
@@ -36,6 +64,154 @@ def test_top_level_editable(tmp_path: Path, libdir_test: Path) -> None:
     assert set(_top_level_editable(PathDistribution(meta_path))) == {
         "basic",
         "dep",
+        "lazy",
         "mis_match",
         "namespace.package",
     }
+
+
+def test_top_level_editable_not_dir(tmp_path: Path) -> None:
+    (tmp_path / "app.pyz").write_bytes(b"")
+    (tmp_path / "fake_editable.pth").write_text(f"\n{tmp_path / 'app.pyz'}\n")
+    (meta_path := (tmp_path / "fake_editable-0.1.dist-info")).mkdir()
+    (meta_path / "RECORD").write_text("fake_editable.pth,,")
+
+    assert list(_top_level_editable(PathDistribution(meta_path))) == []
+
+
+def test_zip_distributions(tmp_path: Path, libdir_test: Path) -> None:
+    app = tmp_path / "app.pyz"
+    with zipfile.ZipFile(app, "w") as zf:
+        zf.writestr("__main__.py", "")
+        for prefix, name, version in [("", "inner", "2.0"), ("lib/", "basic", "9")]:
+            meta_dir = f"{prefix}{name}-{version}.dist-info"
+            zf.writestr(
+                f"{meta_dir}/METADATA",
+                f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n",
+            )
+            zf.writestr(f"{meta_dir}/RECORD", f"{name}/__init__.py,,\n{name}.pth,,\n")
+            zf.writestr(f"{prefix}{name}/__init__.py", "")
+            zf.writestr(f"{prefix}{name}.pth", "/nonexistent\n")
+
+    path = [app / "lib", libdir_test, app]
+    index: dict[str, Distribution] = {}
+    pkg2dists = packages_distributions(path, index=index)
+    assert pkg2dists["basic"] == ["basic", "basic"]
+    assert pkg2dists["inner"] == ["inner"]
+    # the first distribution found wins, like on `sys.path`
+    assert isinstance(index["basic"], ZipDistribution)
+    assert index["basic"].version == "9"
+    assert installed_versions(path)["inner"] == "2.0"
+    assert installed_versions(path[1:])["basic"] == "1.0"
+    # the archive isn’t kept open after reading
+    if (fds := Path("/proc/self/fd")).is_dir():
+        assert str(app) not in {str(fd.resolve()) for fd in fds.iterdir()}
+
+
+@pytest.mark.parametrize(
+    ("name", "expected"),
+    [
+        pytest.param("foo", "foo", id="simple"),
+        pytest.param("Foo_Bar.baz", "foo-bar-baz", id="mixed"),
+        pytest.param("foo__-bar", "foo-bar", id="runs"),
+    ],
+)
+def test_normalize(name: str, expected: str) -> None:
+    assert normalize(name) == expected
+
+
+def test_dependency_graph_cycle() -> None:
+    graph = DependencyGraph(
+        roots=("a", "e"),
+        requires=dict(a=("b",), b=("c",), c=("a", "d"), d=(), e=("d",), f=()),
+    )
+    assert graph.closure["a"] == {"b", "c", "d"}
+    assert graph.closure["c"] == {"a", "b", "d"}
+    assert graph.closure["d"] == set()
+    assert graph.pulled_in_by == dict(b=("a",), c=("a",), d=("a", "e"))
+    assert graph.orphans == ("f",)
+    assert list(graph.tree()) == [
+        (0, "a", False),
+        (1, "b", False),
+        (2, "c", False),
+        (3, "a", True),
+        (3, "d", False),
+        (0, "e", False),
+        (1, "d", False),
+    ]
+
+
+def test_parse_requirements(tmp_path: Path) -> None:
+    (info := tmp_path / "x-1.0.dist-info").mkdir()
+    (info / "METADATA").write_text(
+        "Name: x\nVersion: 1.0\n"
+        "Requires-Dist: Plain_Dep (>=1)\n"
+        'Requires-Dist: pytest; extra == "test"\n'
+        'Requires-Dist: both; python_version >= "3" and extra == "test"\n'
+        'Requires-Dist: never; sys_platform == "no-such-platform"\n'
+        'Requires-Dist: old; python_version < "3.10"\n'
+        'Requires-Dist: new; python_version >= "3.10" or os_name == "nt"\n'
+        'Requires-Dist: approx; python_version ~= "3.0"\n'
+    )
+    reqs = parse_requirements(PathDistribution(info))
+    # unsupported markers (`~=`) are assumed to apply
+    assert reqs == {"plain-dep", "new", "approx"}
+
+
+def test_build_variant(tmp_path: Path) -> None:
+    (meta_path := tmp_path / "fake-0.1.dist-info").mkdir()
+    (meta_path / "WHEEL").write_text(
+        "Wheel-Version: 1.0\nRoot-Is-Purelib: false\n"
+        "Tag: cp312-cp312-manylinux_2_17_x86_64\n"
+        "Tag: cp312-cp312-manylinux2014_x86_64\n"
+    )
+    (meta_path / "INSTALLER").write_text("uv\n")
+    (meta_path / "direct_url.json").write_text(
+        '{"url": "https://github.com/a/fake", '
+        '"vcs_info": {"vcs": "git", "commit_id": "0123456789abcdef"}}'
+    )
+    build = BuildVariant.from_dist(PathDistribution(meta_path))
+    assert build == BuildVariant(
+        tags=("cp312-cp312-manylinux_2_17_x86_64", "cp312-cp312-manylinux2014_x86_64"),
+        installer="uv",
+        url="https://github.com/a/fake",
+        commit="0123456789abcdef",
+    )
+    assert str(build) == (
+        "cp312-cp312-manylinux_2_17_x86_64, cp312-cp312-manylinux2014_x86_64 "
+        "via uv from https://github.com/a/fake@0123456789ab"
+    )
+
+
+def test_build_variant_empty(tmp_path: Path) -> None:
+    (meta_path := tmp_path / "fake-0.1.dist-info").mkdir()
+    (meta_path / "direct_url.json").write_text("not json")
+    build = BuildVariant.from_dist(PathDistribution(meta_path))
+    assert build == BuildVariant()
+    assert str(build) == "not a wheel"
+
+
+@pytest.mark.parametrize(
+    ("cpuinfo", "expected"),
+    [
+        pytest.param(
+            "processor\t: 0\nflags\t\t: fpu sse4_2 avx avx2 fma\n\n"
+            "processor\t: 1\nflags\t\t: fpu sse4_2 avx avx2 fma\n",
+            ("sse4_2", "avx", "avx2", "fma"),
+            id="x86",
+        ),
+        pytest.param(
+            "processor\t: 0\nFeatures\t: fp asimd sve i8mm\n",
+            ("asimd", "sve", "i8mm"),
+            id="arm",
+        ),
+        pytest.param(None, (), id="missing"),
+    ],
+)
+def test_isa_flags(
+    tmp_path: Path, cpuinfo: str | None, expected: tuple[str, ...]
+) -> None:
+    path = tmp_path / "cpuinfo"
+    if cpuinfo is not None:
+        path.write_text(cpuinfo)
+    assert isa_flags(path) == expected
@@ -0,0 +1,134 @@
+# SPDX-License-Identifier: MPL-2.0
+"""Test reading git state without running git."""
+
+from __future__ import annotations
+
+import json
+import shutil
+import subprocess
+from importlib.metadata import PathDistribution
+from typing import TYPE_CHECKING
+
+import pytest
+
+from session_info2 import SessionInfo, _AdditionalInfo
+from session_info2._build import editable_location
+from session_info2._vcs import DIRTY_CHECK_MAX_FILES, GitState, find_repo, git_state
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="needs git")
+
+
+def read_state(root: Path, *, max_files: int = DIRTY_CHECK_MAX_FILES) -> GitState:
+    assert (state := git_state(root, max_files=max_files)) is not None
+    return state
+
+
+def git(repo: Path, *args: str) -> str:
+    cmd = ["git", "-C", str(repo), "-c", "user.name=t", "-c", "user.email=t@t", *args]
+    return subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    repo = tmp_path / "repo"
+    (repo / "src" / "pkg").mkdir(parents=True)
+    (repo / "src" / "pkg" / "__init__.py").write_text("x = 1\n")
+    git(repo, "init", "-q", "-b", "main")
+    git(repo, "add", ".")
+    git(repo, "commit", "-q", "-m", "init")
+    return repo
+
+
+def test_clean(repo: Path) -> None:
+    head = git(repo, "rev-parse", "HEAD").strip()
+    assert find_repo(repo / "src" / "pkg") == repo
+    assert read_state(repo) == GitState(head, "main", dirty=False)
+    assert str(read_state(repo)) == f"git: {head[:12]} on main"
+
+
+def test_dirty(repo: Path) -> None:
+    (repo / "src" / "pkg" / "__init__.py").write_text("x = 12\n")
+    assert read_state(repo).dirty
+
+
+def test_too_many_files(repo: Path) -> None:
+    assert read_state(repo, max_files=0).dirty is None
+
+
+def test_deleted(repo: Path) -> None:
+    (repo / "src" / "pkg" / "__init__.py").unlink()
+    assert read_state(repo).dirty
+
+
+def test_packed_detached(repo: Path) -> None:
+    git(repo, "pack-refs", "--all")
+    head = git(repo, "rev-parse", "HEAD").strip()
+    assert read_state(repo).commit == head
+    git(repo, "checkout", "-q", "--detach")
+    assert read_state(repo) == GitState(head, None, dirty=False)
+
+
+def test_worktree(repo: Path, tmp_path: Path) -> None:
+    git(repo, "worktree", "add", "-q", "-b", "feature", str(tmp_path / "wt"))
+    head = git(repo, "rev-parse", "HEAD").strip()
+    assert read_state(tmp_path / "wt") == GitState(head, "feature", dirty=False)
+
+
+def test_no_commits(tmp_path: Path) -> None:
+    git(tmp_path, "init", "-q", "-b", "main")
+    assert read_state(tmp_path) == GitState(None, "main", dirty=False)
+
+
+@pytest.mark.parametrize(
+    ("state", "expected"),
+    [
+        pytest.param(
+            GitState("0123456789abcdef", "main", dirty=True), ", dirty", id="dirty"
+        ),
+        pytest.param(GitState("0123456789abcdef", "main", dirty=False), "", id="clean"),
+        pytest.param(
+            GitState("0123456789abcdef", "main", dirty=None),
+            ", dirty: unknown",
+            id="unknown",
+        ),
+    ],
+)
+def test_str(state: GitState, expected: str) -> None:
+    assert str(state) == f"git: 0123456789ab on main{expected}"
+
+
+def test_not_a_repo(tmp_path: Path) -> None:
+    assert find_repo(tmp_path) is None
+    assert git_state(tmp_path) is None
+
+
+def test_session_info(repo: Path, tmp_path: Path) -> None:
+    site_packages = tmp_path / "site-packages"
+    (meta_path := site_packages / "pkg-0.1.dist-info").mkdir(parents=True)
+    (meta_path / "METADATA").write_text(
+        "Metadata-Version: 2.1\nName: pkg\nVersion: 0.1\n"
+    )
+    direct_url = dict(url=(repo / "src").as_uri(), dir_info=dict(editable=True))
+    (meta_path / "direct_url.json").write_text(json.dumps(direct_url))
+    dist = PathDistribution(meta_path)
+    assert editable_location(dist) == repo / "src"
+
+    obj = type("Cls", (), dict(__module__="pkg"))()
+    info = _AdditionalInfo(os=None, cpu=None, gpu=())
+    si = SessionInfo(
+        dict(pkg=["pkg"]), dict(obj=obj), info=info, dist_index=dict(pkg=dist)
+    )
+    head = git(repo, "rev-parse", "HEAD").strip()
+    assert repr(si).startswith(f"pkg\t0.1 (git: {head[:12]} on main)\n")
+
+    # a new report sees changes, while the same one stays consistent
+    (repo / "src" / "pkg" / "__init__.py").write_text("x = 12\n")
+    assert repr(si).startswith(f"pkg\t0.1 (git: {head[:12]} on main)\n")
+    si = SessionInfo(
+        dict(pkg=["pkg"]), dict(obj=obj), info=info, dist_index=dict(pkg=dist)
+    )
+    assert repr(si).startswith(f"pkg\t0.1 (git: {head[:12]} on main, dirty)\n")
@@ -0,0 +1,48 @@
+# SPDX-License-Identifier: MPL-2.0
+"""Test collecting session info from worker processes."""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+from session_info2 import collect_worker_sessions
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def test_threads_deduplicated() -> None:
+    with ThreadPoolExecutor(4) as executor:
+        ws = collect_worker_sessions(executor, spread=0)
+    assert ws.parent.pid == os.getpid()
+    assert not ws.workers  # threads run in the parent process
+    assert len(ws.environments) == 1
+    assert not ws.matrix.differing
+
+
+def test_spawned_workers_differ(import_path: Callable[[str], Any]) -> None:
+    # `basic` is importable in the workers (they inherit `sys.path`),
+    # but only loaded in the parent
+    import_path("basic")
+    ctx = mp.get_context("spawn")
+    with ProcessPoolExecutor(2, mp_context=ctx) as executor:
+        ws = collect_worker_sessions(executor)
+    assert ws.workers
+    assert all(w.pid != ws.parent.pid for w in ws.workers)
+    parent_col, *worker_cols = ws.matrix.columns
+    assert "(parent)" in parent_col
+    assert dict(ws.parent.dists)["basic"] == "1.0"
+    assert ws.matrix.differing["basic"][0] == "1.0"
+    assert all(v is None for v in ws.matrix.differing["basic"][1:])
+    assert "basic *\t" in repr(ws)
+    assert len(worker_cols) == len({w.fingerprint for w in ws.workers})
+
+
+def test_pool() -> None:
+    with mp.get_context("spawn").Pool(2) as pool:
+        ws = collect_worker_sessions(pool)
+    assert ws.workers
+    assert ws.matrix._repr_markdown_().startswith("| Distribution ")